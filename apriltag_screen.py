@@ -11,6 +11,7 @@ Tag placement:
 - ID 3: Bottom-left corner  → use tag's top-right corner
 """
 
+import os
 from dataclasses import dataclass
 from typing import Optional
 
@@ -60,11 +61,14 @@ class AprilTagScreenMapper:
         
         self.detector = Detector(
             families="tag16h5",
-            nthreads=4,
-            quad_decimate=1.0,
+            # Half the cores, leaving the rest to hand tracking
+            nthreads=max(1, (os.cpu_count() or 2) // 2),
+            # Find quads at half resolution (corner tags are large), then
+            # refine their edges against the full image to keep accuracy
+            quad_decimate=2.0,
             quad_sigma=0.0,
             refine_edges=True,
-            decode_sharpening=0.25,
+            decode_sharpening=0.0,
         )
         
         self.homography: Optional[np.ndarray] = None
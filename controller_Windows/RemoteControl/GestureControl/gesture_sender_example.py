@@ -7,8 +7,10 @@ Usage:
     python gesture_sender_example.py
 """
 
+import asyncio
 import socket
 import json
+import sys
 import time
 import math
 
@@ -16,15 +18,30 @@ import math
 UDP_IP = "127.0.0.1"
 UDP_PORT = 9090
 
+# socket.sendmsg is not available on Windows
+_HAS_SENDMSG = hasattr(socket.socket, "sendmsg")
+
 def create_udp_socket():
-    """Create a UDP socket for sending gesture data."""
+    """Create a UDP socket for sending gesture data, connected to the receiver."""
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.connect((UDP_IP, UDP_PORT))
     return sock
 
+def send_bytes(sock, payload: bytes):
+    """Send an already-encoded payload on the connected socket without copying it."""
+    try:
+        if _HAS_SENDMSG:
+            sock.sendmsg([memoryview(payload)])
+        else:
+            sock.send(payload)
+    except ConnectionRefusedError:
+        # Receiver not listening yet - a connected UDP socket reports the ICMP error
+        pass
+
 def send_gesture(sock, gesture_data: dict):
     """Send gesture data as JSON over UDP."""
     json_data = json.dumps(gesture_data)
-    sock.sendto(json_data.encode('utf-8'), (UDP_IP, UDP_PORT))
+    send_bytes(sock, json_data.encode('utf-8'))
 
 # ============================================================
 # GESTURE DATA TEMPLATES
@@ -49,6 +66,9 @@ def pointer_gesture(x: float, y: float, screen_index: int = -1, confidence: floa
         "confidence": confidence
     }
 
+# Reused by the high-rate pointer demos - only x/y change between packets
+_POINTER_TEMPLATE = pointer_gesture(0.0, 0.0)
+
 def zoom_gesture(x: float, y: float, stretch: float, screen_index: int = -1, confidence: float = 0.95) -> dict:
     """
     Two-finger zoom gesture - triggers Ctrl+MouseWheel zoom.
@@ -139,25 +159,83 @@ def no_gesture() -> dict:
         "type": "none"
     }
 
+# ============================================================
+# ASYNC STREAMING
+# ============================================================
+
+def _pointer_payloads(points) -> list[bytes]:
+    """Pre-encode pointer packets so the send loop does no trig or JSON work."""
+    payloads = []
+    for x, y in points:
+        _POINTER_TEMPLATE["x"] = x
+        _POINTER_TEMPLATE["y"] = y
+        payloads.append(json.dumps(_POINTER_TEMPLATE).encode('utf-8'))
+    return payloads
+
+async def stream_payloads(sock, payloads: list[bytes], dt: float):
+    """
+    Send payloads at a fixed cadence without blocking the event loop.
+    
+    Pressing Enter cancels the stream where the event loop can watch stdin
+    (not on the Windows proactor loop). Several streams can be gathered to
+    drive concurrent gesture sources.
+    """
+    loop = asyncio.get_running_loop()
+    cancelled = asyncio.Event()
+
+    def on_stdin():
+        sys.stdin.readline()
+        cancelled.set()
+
+    try:
+        loop.add_reader(sys.stdin, on_stdin)
+        watching_stdin = True
+    except (NotImplementedError, ValueError, OSError):
+        watching_stdin = False
+
+    try:
+        for payload in payloads:
+            if cancelled.is_set():
+                print("Cancelled.")
+                break
+            try:
+                await loop.sock_sendall(sock, payload)
+            except ConnectionRefusedError:
+                pass
+            await asyncio.sleep(dt)
+    finally:
+        if watching_stdin:
+            loop.remove_reader(sys.stdin)
+
+def run_async(sock, coro):
+    """Run a demo coroutine to completion from synchronous code."""
+    sock.setblocking(False)
+    try:
+        asyncio.run(coro)
+    finally:
+        sock.setblocking(True)
+
 # ============================================================
 # DEMO SCENARIOS
 # ============================================================
 
-def demo_cursor_movement(sock):
+async def demo_cursor_movement_async(sock):
     """Demonstrate cursor movement in a figure-8 pattern."""
-    print("Demo: Moving cursor in figure-8 pattern...")
+    print("Demo: Moving cursor in figure-8 pattern... (Enter to cancel)")
     
-    for t in range(200):
-        # Parametric figure-8
-        angle = t * 0.05
-        x = 0.5 + 0.3 * math.sin(angle)
-        y = 0.5 + 0.15 * math.sin(2 * angle)
-        
-        send_gesture(sock, pointer_gesture(x, y))
-        time.sleep(0.016)  # ~60 FPS
+    # Parametric figure-8
+    points = (
+        (0.5 + 0.3 * math.sin(t * 0.05), 0.5 + 0.15 * math.sin(2 * t * 0.05))
+        for t in range(200)
+    )
+    await stream_payloads(sock, _pointer_payloads(points), 0.016)  # ~60 FPS
     
     print("Done!")
 
+def demo_cursor_movement(sock):
+    """Demonstrate cursor movement in a figure-8 pattern."""
+    run_async(sock, demo_cursor_movement_async(sock))
+
 def demo_zoom(sock):
     """Demonstrate zoom in and out."""
     print("Demo: Zooming in...")
@@ -235,26 +313,29 @@ def demo_scroll(sock):
     
     print("Done!")
 
-def demo_laser_mode(sock):
+async def demo_laser_mode_async(sock):
     """Demonstrate laser pointer mode toggle."""
     print("Demo: Toggling to Laser Pointer mode...")
-    send_gesture(sock, clap_gesture())
-    time.sleep(1.0)
+    await stream_payloads(sock, [json.dumps(clap_gesture()).encode('utf-8')], 0.0)
+    await asyncio.sleep(1.0)
     
-    print("Demo: Moving laser pointer...")
-    for t in range(1000):
-        angle = t * 0.1
-        x = 0.5 + 0.3 * math.cos(angle)
-        y = 0.5 + 0.2 * math.sin(angle)
-        send_gesture(sock, pointer_gesture(x, y))
-        time.sleep(0.0016)
+    print("Demo: Moving laser pointer... (Enter to cancel)")
+    points = (
+        (0.5 + 0.3 * math.cos(t * 0.1), 0.5 + 0.2 * math.sin(t * 0.1))
+        for t in range(1000)
+    )
+    await stream_payloads(sock, _pointer_payloads(points), 0.0016)
     
     print("Demo: Toggling back to Cursor mode...")
-    send_gesture(sock, clap_gesture())
-    time.sleep(0.5)
+    await stream_payloads(sock, [json.dumps(clap_gesture()).encode('utf-8')], 0.0)
+    await asyncio.sleep(0.5)
     
     print("Done!")
 
+def demo_laser_mode(sock):
+    """Demonstrate laser pointer mode toggle."""
+    run_async(sock, demo_laser_mode_async(sock))
+
 def demo_multi_screen(sock):
     """Demonstrate cursor movement on specific screens."""
     print("Demo: Multi-screen cursor control")
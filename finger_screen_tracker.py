@@ -38,6 +38,8 @@ def run_finger_tracker(camera_index: int = 0) -> None:
 
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_WIDTH)
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_HEIGHT)
+    # Keep only the newest frame in the driver queue to avoid processing stale frames
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
 
     with HandTracker() as tracker, TrackerDisplay() as display:
         mapper = MultiScreenMapper()
@@ -10,6 +10,10 @@ Corner tag assignment:
 - ID 3: Bottom-left
 """
 
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import cv2
@@ -20,11 +24,45 @@ APRILTAG_DICT = cv2.aruco.getPredefinedDictionary(cv2.aruco.DICT_APRILTAG_16h5)
 MAX_TAG_ID = 29
 MAX_SCREENS = 7
 
+# Tags are pure black/white with long runs: fast RLE deflate gives near-identical size
+PNG_PARAMS = [
+    cv2.IMWRITE_PNG_COMPRESSION, 1,
+    cv2.IMWRITE_PNG_STRATEGY, cv2.IMWRITE_PNG_STRATEGY_RLE,
+]
 
+# White margin around each tag for easier cutting
+TAG_MARGIN = 50
+
+# One bordered canvas per worker thread, reused between tags
+_canvases = threading.local()
+
+
+def _write_png(path: Path, img: np.ndarray) -> None:
+    """Encode a PNG in memory and write it out in one call."""
+    ok, buf = cv2.imencode(".png", img, PNG_PARAMS)
+    if not ok:
+        raise ValueError(f"Failed to encode {path}")
+    Path(path).write_bytes(buf)
+
+
+@functools.lru_cache(maxsize=MAX_TAG_ID + 1)
+def _tag_cells(tag_id: int) -> np.ndarray:
+    """One pixel per cell: the tag's bit pattern inside a 1-cell black border."""
+    bits = cv2.aruco.Dictionary.getBitsFromByteList(
+        APRILTAG_DICT.bytesList[tag_id:tag_id + 1], APRILTAG_DICT.markerSize
+    )
+    cells = np.zeros((APRILTAG_DICT.markerSize + 2,) * 2, dtype=np.uint8)
+    cells[1:-1, 1:-1] = bits * 255
+    return cells
+
+
+@functools.lru_cache(maxsize=MAX_TAG_ID + 1)
 def generate_apriltag(tag_id: int, size: int = 200) -> np.ndarray:
     """
     Generate a tag16h5 AprilTag image.
     
+    Results are cached per (tag_id, size); the returned array is read-only.
+    
     Args:
         tag_id: Tag ID (0-29)
         size: Output image size in pixels
@@ -35,7 +73,39 @@ def generate_apriltag(tag_id: int, size: int = 200) -> np.ndarray:
     if not 0 <= tag_id <= MAX_TAG_ID:
         raise ValueError(f"Tag ID must be 0-{MAX_TAG_ID}, got {tag_id}")
     
-    return cv2.aruco.generateImageMarker(APRILTAG_DICT, tag_id, size)
+    # Same nearest-neighbour upscale generateImageMarker does internally
+    img = cv2.resize(_tag_cells(tag_id), (size, size), interpolation=cv2.INTER_NEAREST)
+    img.flags.writeable = False
+    return img
+
+
+def _get_canvas(size: int) -> np.ndarray:
+    """Return this thread's white canvas for a tag of the given size."""
+    side = size + 2 * TAG_MARGIN
+    canvas = getattr(_canvases, "canvas", None)
+    if canvas is None or canvas.shape[0] != side:
+        canvas = np.full((side, side), 255, dtype=np.uint8)
+        _canvases.canvas = canvas
+    return canvas
+
+
+def _render_into(canvas: np.ndarray, img: np.ndarray, label_text: str):
+    """Write a tag and its label into a canvas, leaving the margin untouched."""
+    size = img.shape[0]
+    margin = TAG_MARGIN
+    canvas[margin:margin + size, margin:margin + size] = img
+    
+    # Clear the previous label strip before drawing the new one
+    canvas[margin + size:] = 255
+    cv2.putText(
+        canvas,
+        label_text,
+        (margin, size + margin + 35),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        0.6,
+        0,
+        2
+    )
 
 
 def generate_single_tag(
@@ -43,7 +113,7 @@ def generate_single_tag(
     output_path: Path,
     size: int = 300,
     label: str | None = None,
-) -> Path:
+) -> tuple[Path, np.ndarray]:
     """
     Generate a single AprilTag and save to file.
     
@@ -54,31 +124,40 @@ def generate_single_tag(
         label: Optional label text below the tag
         
     Returns:
-        Path to the saved file
+        (path to the saved file, grayscale image that was written).
+        The image is a per-thread buffer, overwritten by the next call.
     """
-    img = generate_apriltag(tag_id, size)
-    
-    # Add white margin for easier cutting
-    margin = 50
-    bordered = np.ones((size + 2 * margin, size + 2 * margin), dtype=np.uint8) * 255
-    bordered[margin:margin + size, margin:margin + size] = img
-    
-    # Add label
-    label_text = label or f"ID {tag_id}"
-    cv2.putText(
-        bordered,
-        label_text,
-        (margin, size + margin + 35),
-        cv2.FONT_HERSHEY_SIMPLEX,
-        0.6,
-        0,
-        2
-    )
+    bordered = _get_canvas(size)
+    _render_into(bordered, generate_apriltag(tag_id, size), label or f"ID {tag_id}")
     
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    cv2.imwrite(str(output_path), bordered)
-    return output_path
+    _write_png(output_path, bordered)
+    return output_path, bordered
+
+
+def _generate_tag_bgr(
+    tag_id: int, output_path: Path, size: int, label: str
+) -> tuple[Path, np.ndarray]:
+    """Generate a tag and return a BGR copy that outlives the thread's canvas."""
+    output_path, img = generate_single_tag(tag_id, output_path, size, label)
+    return output_path, cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+
+
+def _tile_corners(tags: list[np.ndarray], out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Lay out [TL, TR, BR, BL] tags as a 2x2 grid matching the screen corners.
+    
+    Tiles are copied straight into ``out`` (allocated if not given).
+    """
+    h, w = tags[0].shape[:2]
+    if out is None:
+        out = np.empty((2 * h, 2 * w) + tags[0].shape[2:], dtype=tags[0].dtype)
+    out[:h, :w] = tags[0]
+    out[:h, w:] = tags[1]
+    out[h:, w:] = tags[2]
+    out[h:, :w] = tags[3]
+    return out
 
 
 def generate_tags(
@@ -100,15 +179,22 @@ def generate_tags(
         List of paths to generated files
     """
     output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
     labels = labels or {}
-    paths = []
+    paths = [output_dir / f"tag_{tag_id}.png" for tag_id in tag_ids]
+    
+    # Tags are independent and PNG encoding releases the GIL
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        list(pool.map(
+            lambda tag_id, filename: generate_single_tag(
+                tag_id, filename, size, labels.get(tag_id, f"ID {tag_id}")
+            ),
+            tag_ids,
+            paths,
+        ))
     
-    for tag_id in tag_ids:
-        label = labels.get(tag_id, f"ID {tag_id}")
-        filename = output_dir / f"tag_{tag_id}.png"
-        generate_single_tag(tag_id, filename, size, label)
+    for filename in paths:
         print(f"Generated: {filename}")
-        paths.append(filename)
     
     return paths
 
@@ -125,25 +211,18 @@ def generate_corner_tags(output_dir: Path, size: int = 300):
     }
     corner_names = ["top_left", "top_right", "bottom_right", "bottom_left"]
     
-    # Generate individual tags
+    # Generate individual tags, keeping the images for the combined sheet
+    tags = []
     for tag_id in range(4):
         filename = output_dir / f"tag_{tag_id}_{corner_names[tag_id]}.png"
-        generate_single_tag(tag_id, filename, size, corner_labels[tag_id])
+        _, img = generate_single_tag(tag_id, filename, size, corner_labels[tag_id])
         print(f"Generated: {filename}")
+        tags.append(cv2.cvtColor(img, cv2.COLOR_GRAY2BGR))
     
-    # Create combined sheet for easy printing
-    tags = [
-        cv2.imread(str(output_dir / f"tag_{i}_{corner_names[i]}.png"))
-        for i in range(4)
-    ]
-    
-    # 2x2 grid layout matching screen corners
-    row1 = np.hstack([tags[0], tags[1]])  # TL, TR
-    row2 = np.hstack([tags[3], tags[2]])  # BL, BR
-    combined = np.vstack([row1, row2])
+    combined = _tile_corners(tags)
     
     combined_path = output_dir / "all_tags_printable.png"
-    cv2.imwrite(str(combined_path), combined)
+    _write_png(combined_path, combined)
     print(f"\nCombined printable sheet: {combined_path}")
 
 
@@ -177,39 +256,49 @@ def generate_multiscreen_tags(
     screen_names = screen_names or [f"Screen {i}" for i in range(num_screens)]
     corner_positions = ["TL", "TR", "BR", "BL"]
     
-    all_tag_images = []
+    # Every per-screen sheet is a slice of the combined sheet
+    sheet_side = 2 * (size + 2 * TAG_MARGIN)
+    combined = np.empty((num_screens * sheet_side, sheet_side, 3), dtype=np.uint8)
     
-    for screen_idx in range(num_screens):
-        screen_name = screen_names[screen_idx] if screen_idx < len(screen_names) else f"Screen {screen_idx}"
-        base_id = screen_idx * 4
-        
-        print(f"\n{screen_name} (IDs {base_id}-{base_id + 3}):")
-        
-        screen_tags = []
-        for corner_idx, corner in enumerate(corner_positions):
-            tag_id = base_id + corner_idx
-            label = f"ID {tag_id} - {screen_name} {corner}"
-            filename = output_dir / f"screen{screen_idx}_tag{tag_id}_{corner.lower()}.png"
-            generate_single_tag(tag_id, filename, size, label)
-            print(f"  {filename.name}")
-            screen_tags.append(cv2.imread(str(filename)))
-        
-        # Create per-screen printable sheet
-        row1 = np.hstack([screen_tags[0], screen_tags[1]])
-        row2 = np.hstack([screen_tags[3], screen_tags[2]])
-        screen_sheet = np.vstack([row1, row2])
-        
-        sheet_path = output_dir / f"screen{screen_idx}_printable.png"
-        cv2.imwrite(str(sheet_path), screen_sheet)
-        print(f"  Printable: {sheet_path.name}")
+    # Render all tags in parallel (PNG encoding releases the GIL),
+    # then assemble the sheets in order on this thread
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        screen_jobs = []
+        for screen_idx in range(num_screens):
+            screen_name = screen_names[screen_idx] if screen_idx < len(screen_names) else f"Screen {screen_idx}"
+            base_id = screen_idx * 4
+            screen_prefix = str(output_dir / f"screen{screen_idx}")
+            
+            futures = []
+            for corner_idx, corner in enumerate(corner_positions):
+                tag_id = base_id + corner_idx
+                label = f"ID {tag_id} - {screen_name} {corner}"
+                filename = Path(f"{screen_prefix}_tag{tag_id}_{corner.lower()}.png")
+                futures.append(pool.submit(_generate_tag_bgr, tag_id, filename, size, label))
+            screen_jobs.append((screen_name, base_id, screen_prefix, futures))
         
-        all_tag_images.append(screen_sheet)
+        for screen_idx, (screen_name, base_id, screen_prefix, futures) in enumerate(screen_jobs):
+            print(f"\n{screen_name} (IDs {base_id}-{base_id + 3}):")
+            
+            screen_tags = []
+            for future in futures:
+                filename, img = future.result()
+                print(f"  {filename.name}")
+                screen_tags.append(img)
+            
+            # Create per-screen printable sheet
+            screen_sheet = _tile_corners(
+                screen_tags, combined[screen_idx * sheet_side:(screen_idx + 1) * sheet_side]
+            )
+            
+            sheet_path = Path(f"{screen_prefix}_printable.png")
+            _write_png(sheet_path, screen_sheet)
+            print(f"  Printable: {sheet_path.name}")
     
     # Combined sheet with all screens
     if num_screens > 1:
-        combined = np.vstack(all_tag_images)
         combined_path = output_dir / "all_screens_printable.png"
-        cv2.imwrite(str(combined_path), combined)
+        _write_png(combined_path, combined)
         print(f"\nCombined all screens: {combined_path}")
 
 
@@ -6,11 +6,14 @@ Detects: Pointer, Pinch, TwoFingerSwipe, Stretch, HandRot, Clap
 
 import cv2
 import mediapipe as mp
+import queue
+import threading
 import time
 
 from src.hand_gestures import (
     VIEW_MODE, MAX_NUM_HANDS,
     HandFeatures,
+    LandmarkArrays,
     extract_features,
     get_handedness_label,
     HandState,
@@ -23,38 +26,67 @@ from src.hand_gestures import (
     ClapDetector,
     StretchDetector,
 )
-from src.hand_gestures.config import DISPLAY_FLIP, PROCESS_FLIP, STRETCH_REQUIRE_POINTERS
+from src.hand_tracks import FrameGrabber
+from src.hand_gestures.config import (
+    PROCESS_FLIP, STRETCH_REQUIRE_POINTERS, MODEL_COMPLEXITY,
+)
+from src.hand_gestures.display import (
+    NET_FLIP,
+    configure_opencv_threads,
+    draw_overlay,
+    get_display_label,
+    hand_overlay_line,
+    inference_frame,
+    to_frame_px,
+)
 
 mp_drawing = mp.solutions.drawing_utils
 mp_hands = mp.solutions.hands
 
-
-def _get_display_label(d: DetectedHand, state: HandState, now: float) -> str:
-    """Get display label for detected hand."""
-    if d.thumbrot:
-        return "HandRot"
-    if now < state.latched_until:
-        return state.latched_label
-    if d.pinch:
-        return "Pinch (held)"
-    if d.two_finger:
-        return "TwoFinger (ready)"
-    if d.pointer:
-        return "Pointer"
-    return "Neutral"
-
-
-def _draw_overlay(frame, overlay: list[str]):
-    """Draw text overlay on frame."""
-    x0, y0, line_h = 12, 22, 22
-    max_chars = max(len(s) for s in overlay)
-    box_w = min(16 + max_chars * 9, frame.shape[1] - 24)
-    box_h = 12 + line_h * len(overlay)
-
-    cv2.rectangle(frame, (8, 8), (8 + box_w, 8 + box_h), (0, 0, 0), -1)
-    for i, s in enumerate(overlay):
-        cv2.putText(frame, s, (x0, y0 + i * line_h),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2, cv2.LINE_AA)
+configure_opencv_threads()
+
+# Filled green joints over the default light-grey skeleton
+LM_SPEC = mp_drawing.DrawingSpec(color=(0, 255, 0), thickness=-1, circle_radius=5)
+CONN_SPEC = mp_drawing.DrawingSpec(color=(224, 224, 224), thickness=2)
+
+
+def _inference_worker(
+    grabber: FrameGrabber,
+    hands,
+    render_q: queue.Queue,
+    stop: threading.Event,
+) -> None:
+    """Run MediaPipe on camera frames, queueing (frame, results, now) for the main thread."""
+    rgb = None
+    small_buf = None
+    while not stop.is_set():
+        latest = grabber.read(timeout=0.1)
+        if latest is None:
+            continue
+        _, frame = latest
+
+        now = time.monotonic()
+
+        # Downscale for MediaPipe and convert to RGB, both into the previous
+        # frame's buffers when the size matches
+        small = inference_frame(frame, small_buf)
+        if small is not frame:
+            small_buf = small
+        if rgb is None or rgb.shape != small.shape:
+            rgb = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
+        else:
+            rgb.flags.writeable = True
+            cv2.cvtColor(small, cv2.COLOR_BGR2RGB, dst=rgb)
+        rgb.flags.writeable = False
+        results = hands.process(rgb)
+
+        # Block while the main thread is behind, but keep checking for shutdown
+        while not stop.is_set():
+            try:
+                render_q.put((frame, results, now), timeout=0.1)
+                break
+            except queue.Full:
+                continue
 
 
 def main():
@@ -62,6 +94,11 @@ def main():
     if not cap.isOpened():
         print("ERROR: Could not open webcam.")
         return
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    # Read the camera on its own thread so inference never waits on it
+    grabber = FrameGrabber(cap)
+    grabber.start()
 
     # Per-hand state
     states = {k: HandState(label=k) for k in ["Left", "Right", "Unknown"]}
@@ -70,128 +107,132 @@ def main():
     clap_detector = ClapDetector()
     stretch_detector = StretchDetector()
 
+    landmark_buf = LandmarkArrays(MAX_NUM_HANDS)
+
     with mp_hands.Hands(
         static_image_mode=False,
         max_num_hands=MAX_NUM_HANDS,
-        model_complexity=1,
+        model_complexity=MODEL_COMPLEXITY,
         min_detection_confidence=0.5,
         min_tracking_confidence=0.5
     ) as hands:
 
-        while cap.isOpened():
-            ok, frame = cap.read()
-            if not ok:
-                continue
-
-            if PROCESS_FLIP:
-                frame = cv2.flip(frame, 1)
-
-            h, w = frame.shape[:2]
-            now = time.time()
-
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            rgb.flags.writeable = False
-            results = hands.process(rgb)
-
-            detected: list[DetectedHand] = []
-            overlay = [f"Mode: {VIEW_MODE.value}"]
-
-            # Process detected hands
-            used_labels = set()
-            if results.multi_hand_landmarks:
-                for i, hand_landmarks in enumerate(results.multi_hand_landmarks):
-                    # Determine handedness label
-                    lbl = "Unknown"
-                    if results.multi_handedness and i < len(results.multi_handedness):
-                        lbl = get_handedness_label(results.multi_handedness[i])
-
-                    if lbl in used_labels:
-                        lbl = "Left" if "Left" not in used_labels else (
-                            "Right" if "Right" not in used_labels else "Unknown"
-                        )
-                    used_labels.add(lbl)
-
-                    # Extract landmarks
-                    px = [(int(lm.x * w), int(lm.y * h)) for lm in hand_landmarks.landmark]
-                    n3 = [(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark]
-                    feats = extract_features(px, n3)
-
-                    state = states[lbl]
-                    clap_detector.update_last_seen(lbl, feats, now)
-
-                    # Detect poses
-                    pointer = is_pointer(feats)
-                    two_finger = is_two_finger_pose(feats)
-
-                    # Update thumbrot detection
-                    thumbrot, yaw, pitch, roll = update_thumbrot(state, feats, now, pointer)
-
-                    # Update pinch detection (suppressed during thumbrot or two-finger)
-                    pinch = update_pinch(state, feats, now, suppressed=(thumbrot or two_finger))
-
-                    if pinch:
-                        pointer = False
-
-                    # Draw hand
-                    mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-                    for lm in hand_landmarks.landmark:
-                        cv2.circle(frame, (int(lm.x * w), int(lm.y * h)), 5, (0, 255, 0), -1)
-
-                    if pointer or pinch:
-                        cv2.circle(frame, feats.index_tip_px, 10, (0, 255, 0), -1)
-
-                    detected.append(DetectedHand(
-                        label=lbl, feats=feats, pointer=pointer,
-                        two_finger=two_finger, pinch=pinch, thumbrot=thumbrot,
-                        yaw=yaw, pitch=pitch, roll=roll,
-                    ))
-
-            # Two-hand gestures
-            clap_active, clap_intent = clap_detector.update(detected, now)
-            if clap_active:
-                overlay.append("GLOBAL: Clap")
-
-            # Two-finger swipe detection
-            for d in detected:
-                state = states[d.label]
-                suppressed = clap_active or clap_intent or d.thumbrot or d.pinch
-                update_two_finger_swipe(state, d.feats, now, d.two_finger, suppressed)
-
-            # Stretch detection
-            stretch_active, stretch_delta, stretch_speed, stretch_cumulative = (
-                stretch_detector.update(detected, now, STRETCH_REQUIRE_POINTERS)
-            )
-            if stretch_active:
-                p0, p1 = detected[0].feats.index_tip_px, detected[1].feats.index_tip_px
-                cv2.line(frame, p0, p1, (255, 255, 255), 2)
-                overlay.append(f"Stretch Δ: {stretch_delta:+.1f}px  ({stretch_speed:+.0f}px/s)")
-                overlay.append(f"Stretch Σ: {stretch_cumulative:+.1f}px")
-
-            # Build overlay text
-            if detected:
+        # MediaPipe runs on a worker thread, so the next frame is inferred
+        # while this one is drawn; maxsize=1 keeps it at most one frame ahead
+        render_q: queue.Queue = queue.Queue(maxsize=1)
+        stop = threading.Event()
+        worker = threading.Thread(
+            target=_inference_worker, args=(grabber, hands, render_q, stop), daemon=True
+        )
+        worker.start()
+
+        try:
+            while cap.isOpened():
+                try:
+                    frame, results, now = render_q.get(timeout=1.0)
+                except queue.Empty:
+                    continue
+
+                h, w = frame.shape[:2]
+
+                detected: list[DetectedHand] = []
+                overlay = [f"Mode: {VIEW_MODE.value}"]
+
+                # Process detected hands
+                used_labels = set()
+                if results.multi_hand_landmarks:
+                    for i, hand_landmarks in enumerate(results.multi_hand_landmarks):
+                        # Determine handedness label
+                        lbl = "Unknown"
+                        if results.multi_handedness and i < len(results.multi_handedness):
+                            lbl = get_handedness_label(results.multi_handedness[i], PROCESS_FLIP)
+
+                        if lbl in used_labels:
+                            lbl = "Left" if "Left" not in used_labels else (
+                                "Right" if "Right" not in used_labels else "Unknown"
+                            )
+                        used_labels.add(lbl)
+
+                        # Extract landmarks
+                        px, n3 = landmark_buf.load(hand_landmarks, w, h, PROCESS_FLIP, slot=i)
+                        feats = extract_features(px, n3)
+
+                        state = states[lbl]
+                        clap_detector.update_last_seen(lbl, feats, now)
+
+                        # Detect poses
+                        pointer = is_pointer(feats)
+                        two_finger = is_two_finger_pose(feats)
+
+                        # Update thumbrot detection
+                        thumbrot, yaw, pitch, roll = update_thumbrot(state, feats, now, pointer)
+
+                        # Update pinch detection (suppressed during thumbrot or two-finger)
+                        pinch = update_pinch(state, feats, now, suppressed=(thumbrot or two_finger))
+
+                        if pinch:
+                            pointer = False
+
+                        # Draw hand
+                        mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS, LM_SPEC, CONN_SPEC)
+
+                        if pointer or pinch:
+                            cv2.circle(frame, to_frame_px(feats.index_tip_px, w), 10, (0, 255, 0), -1)
+
+                        detected.append(DetectedHand(
+                            label=lbl, feats=feats, pointer=pointer,
+                            two_finger=two_finger, pinch=pinch, thumbrot=thumbrot,
+                            yaw=yaw, pitch=pitch, roll=roll, state=state,
+                        ))
+
+                # Two-hand gestures
+                clap_active, clap_intent = clap_detector.update(detected, now)
+                if clap_active:
+                    overlay.append("GLOBAL: Clap")
+
+                # Two-finger swipe detection
                 for d in detected:
-                    state = states[d.label]
-                    disp = _get_display_label(d, state, now)
-
-                    if d.thumbrot and d.yaw is not None:
-                        overlay.append(f"{d.label}: {disp}  yaw={d.yaw:+.1f}  pitch={d.pitch:+.1f}  roll={d.roll:+.1f}")
-                    else:
-                        overlay.append(f"{d.label}: {disp}")
-
-                    if d.pointer:
-                        ix, iy = d.feats.index_tip_px
-                        overlay.append(f"  Ptr: ({ix},{iy})")
-            else:
-                overlay.append("No hands detected")
-
-            # Display
-            display_frame = cv2.flip(frame, 1) if DISPLAY_FLIP else frame
-            _draw_overlay(display_frame, overlay)
-            cv2.imshow("Gestures: Pointer / Pinch / TwoFingerSwipe / StretchDelta / HandRot / Clap", display_frame)
-
-            if cv2.waitKey(1) & 0xFF in (27, ord('q')):
-                break
-
+                    state = d.state
+                    suppressed = clap_active or clap_intent or d.thumbrot or d.pinch
+                    update_two_finger_swipe(state, d.feats, now, d.two_finger, suppressed)
+
+                # Stretch detection
+                stretch_active, stretch_delta, stretch_speed, stretch_cumulative = (
+                    stretch_detector.update(detected, now, STRETCH_REQUIRE_POINTERS)
+                )
+                if stretch_active:
+                    p0, p1 = detected[0].feats.index_tip_px, detected[1].feats.index_tip_px
+                    cv2.line(frame, to_frame_px(p0, w), to_frame_px(p1, w), (255, 255, 255), 2)
+                    overlay.append(f"Stretch Δ: {stretch_delta:+.1f}px  ({stretch_speed:+.0f}px/s)")
+                    overlay.append(f"Stretch Σ: {stretch_cumulative:+.1f}px")
+
+                # Build overlay text
+                if detected:
+                    for d in detected:
+                        state = d.state
+                        disp = get_display_label(d, state, now)
+
+                        overlay.append(hand_overlay_line(d, state, disp))
+
+                        if d.pointer:
+                            ix, iy = d.feats.index_tip_px
+                            overlay.append(f"  Ptr: ({ix},{iy})")
+                else:
+                    overlay.append("No hands detected")
+
+                # Display
+                # Nothing reads the camera frame after this, so mirror it in place
+                display_frame = cv2.flip(frame, 1, dst=frame) if NET_FLIP else frame
+                draw_overlay(display_frame, overlay)
+                cv2.imshow("Gestures: Pointer / Pinch / TwoFingerSwipe / StretchDelta / HandRot / Clap", display_frame)
+
+                if cv2.waitKey(1) & 0xFF in (27, ord('q')):
+                    break
+        finally:
+            stop.set()
+            worker.join(timeout=1.0)
+
+    grabber.stop()
     cap.release()
     cv2.destroyAllWindows()
 
@@ -8,7 +8,11 @@ Combines:
 """
 
 import cv2
+import numpy as np
+import queue
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Literal
 
@@ -16,6 +20,7 @@ from apriltage import CAMERA_WIDTH, CAMERA_HEIGHT
 from server.receiver import LowLatencyReceiver, PORT
 from src.hand_gestures import (
     VIEW_MODE, MAX_NUM_HANDS,
+    LandmarkArrays,
     extract_features,
     get_handedness_label,
     HandState,
@@ -28,7 +33,18 @@ from src.hand_gestures import (
     ClapDetector,
     StretchDetector,
 )
-from src.hand_gestures.config import DISPLAY_FLIP, PROCESS_FLIP, STRETCH_REQUIRE_POINTERS
+from src.hand_gestures.config import (
+    PROCESS_FLIP, STRETCH_REQUIRE_POINTERS, MODEL_COMPLEXITY,
+)
+from src.hand_gestures.display import (
+    NET_FLIP,
+    configure_opencv_threads,
+    draw_overlay,
+    get_display_label,
+    hand_overlay_line,
+    inference_frame,
+    to_frame_px,
+)
 from src.hand_tracks import MultiScreenMapper, TrackerDisplay, ScreenResult
 from backend_service import GestureBackendService
 
@@ -37,6 +53,26 @@ import mediapipe as mp
 mp_drawing = mp.solutions.drawing_utils
 mp_hands = mp.solutions.hands
 
+configure_opencv_threads()
+
+# Filled green joints over the default light-grey skeleton
+LM_SPEC = mp_drawing.DrawingSpec(color=(0, 255, 0), thickness=-1, circle_radius=5)
+CONN_SPEC = mp_drawing.DrawingSpec(color=(224, 224, 224), thickness=2)
+
+# Landmark conversion buffers, one slot per hand, reused across frames
+_landmark_buf = LandmarkArrays(MAX_NUM_HANDS)
+
+# Frames waiting for the render stage. The worker flips each received frame
+# into a ring of buffers big enough that none is reused while still queued
+# (queue + one being rendered + one being filled)
+RENDER_QUEUE_SIZE = 2
+_FLIP_RING_SIZE = RENDER_QUEUE_SIZE + 2
+
+# Consecutive frames the finger must be off every known screen before an early
+# tag scan is requested; one per miss streak, after that the mapper's regular
+# cadence applies, so a hand resting off the slides doesn't scan every frame
+REDETECT_AFTER_MISSES = 3
+
 
 INSTRUCTIONS = """
 ==================================================
@@ -54,36 +90,6 @@ Controls:
 """
 
 
-def _get_display_label(d: DetectedHand, state: HandState, now: float) -> str:
-    """Get display label for detected hand."""
-    if d.thumbrot:
-        return "HandRot"
-    if now < state.latched_until:
-        return state.latched_label
-    if d.pinch:
-        return "Pinch (held)"
-    if d.two_finger:
-        return "TwoFinger (ready)"
-    if d.pointer:
-        return "Pointer"
-    return "Neutral"
-
-
-def _draw_overlay(frame, overlay: list[str]):
-    """Draw text overlay on frame."""
-    if not overlay:
-        return
-    x0, y0, line_h = 12, 22, 22
-    max_chars = max(len(s) for s in overlay)
-    box_w = min(16 + max_chars * 9, frame.shape[1] - 24)
-    box_h = 12 + line_h * len(overlay)
-
-    cv2.rectangle(frame, (8, 8), (8 + box_w, 8 + box_h), (0, 0, 0), -1)
-    for i, s in enumerate(overlay):
-        cv2.putText(frame, s, (x0, y0 + i * line_h),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2, cv2.LINE_AA)
-
-
 @dataclass
 class FrameGestureData:
     """Aggregated gesture data for a single frame."""
@@ -94,6 +100,7 @@ class FrameGestureData:
     stretch_cumulative: float
     swipe_detected: bool
     swipe_direction: Literal["left", "right"] | None
+    active_finger: tuple[int, int] | None = None
 
 
 def process_hands(
@@ -120,7 +127,7 @@ def process_hands(
             # Determine handedness label
             lbl = "Unknown"
             if results.multi_handedness and i < len(results.multi_handedness):
-                lbl = get_handedness_label(results.multi_handedness[i])
+                lbl = get_handedness_label(results.multi_handedness[i], PROCESS_FLIP)
 
             if lbl in used_labels:
                 lbl = "Left" if "Left" not in used_labels else (
@@ -129,8 +136,7 @@ def process_hands(
             used_labels.add(lbl)
 
             # Extract landmarks
-            px = [(int(lm.x * w), int(lm.y * h)) for lm in hand_landmarks.landmark]
-            n3 = [(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark]
+            px, n3 = _landmark_buf.load(hand_landmarks, w, h, PROCESS_FLIP, slot=i)
             feats = extract_features(px, n3)
 
             state = states[lbl]
@@ -150,17 +156,15 @@ def process_hands(
                 pointer = False
 
             # Draw hand
-            mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-            for lm in hand_landmarks.landmark:
-                cv2.circle(frame, (int(lm.x * w), int(lm.y * h)), 5, (0, 255, 0), -1)
+            mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS, LM_SPEC, CONN_SPEC)
 
             if pointer or pinch:
-                cv2.circle(frame, feats.index_tip_px, 10, (0, 255, 0), -1)
+                cv2.circle(frame, to_frame_px(feats.index_tip_px, w), 10, (0, 255, 0), -1)
 
             detected.append(DetectedHand(
                 label=lbl, feats=feats, pointer=pointer,
                 two_finger=two_finger, pinch=pinch, thumbrot=thumbrot,
-                yaw=yaw, pitch=pitch, roll=roll,
+                yaw=yaw, pitch=pitch, roll=roll, state=state,
             ))
 
     # Two-hand gestures
@@ -172,7 +176,7 @@ def process_hands(
     swipe_detected = False
     swipe_direction: Literal["left", "right"] | None = None
     for d in detected:
-        state = states[d.label]
+        state = d.state
         suppressed = clap_active or clap_intent or d.thumbrot or d.pinch
         detected_swipe, direction = update_two_finger_swipe(state, d.feats, now, d.two_finger, suppressed)
         if detected_swipe and direction:
@@ -186,20 +190,15 @@ def process_hands(
     )
     if stretch_active and len(detected) >= 2:
         p0, p1 = detected[0].feats.index_tip_px, detected[1].feats.index_tip_px
-        cv2.line(frame, p0, p1, (255, 255, 255), 2)
+        cv2.line(frame, to_frame_px(p0, w), to_frame_px(p1, w), (255, 255, 255), 2)
         overlay.append(f"Stretch Δ: {stretch_delta:+.1f}px  ({stretch_speed:+.0f}px/s)")
         overlay.append(f"Stretch Σ: {stretch_cumulative:+.1f}px")
 
     # Build overlay text for each hand
+    active_finger, labels = _resolve_hands(detected, now)
     if detected:
-        for d in detected:
-            state = states[d.label]
-            disp = _get_display_label(d, state, now)
-
-            if d.thumbrot and d.yaw is not None:
-                overlay.append(f"{d.label}: {disp}  yaw={d.yaw:+.1f}  pitch={d.pitch:+.1f}  roll={d.roll:+.1f}")
-            else:
-                overlay.append(f"{d.label}: {disp}")
+        for d, disp in zip(detected, labels):
+            overlay.append(hand_overlay_line(d, d.state, disp))
     else:
         overlay.append("No hands detected")
 
@@ -211,19 +210,93 @@ def process_hands(
         stretch_cumulative=stretch_cumulative,
         swipe_detected=swipe_detected,
         swipe_direction=swipe_direction,
+        active_finger=active_finger,
     )
 
 
-def get_active_finger(detected: list[DetectedHand]) -> tuple[int, int] | None:
-    """Get the index finger position from the first hand in pointer or pinch mode."""
-    # Priority: pointer mode first, then pinch mode
+def _resolve_hands(
+    detected: list[DetectedHand], now: float
+) -> tuple[tuple[int, int] | None, list[str]]:
+    """
+    Resolve the active finger and every hand's display label in one pass.
+    
+    The active finger is the index tip of the first hand in pointer mode,
+    else of the first hand in pinch mode.
+    """
+    pointer_pos = pinch_pos = None
+    labels = []
     for d in detected:
         if d.pointer:
-            return d.feats.index_tip_px
-    for d in detected:
-        if d.pinch:
-            return d.feats.index_tip_px
-    return None
+            if pointer_pos is None:
+                pointer_pos = d.feats.index_tip_px
+        elif d.pinch and pinch_pos is None:
+            pinch_pos = d.feats.index_tip_px
+        labels.append(get_display_label(d, d.state, now))
+    return pointer_pos or pinch_pos, labels
+
+
+def _inference_worker(
+    receiver: LowLatencyReceiver,
+    hands,
+    mapper: MultiScreenMapper,
+    render_q: queue.Queue,
+    stop: threading.Event,
+) -> None:
+    """
+    Fetch frames and run MediaPipe, with AprilTag detection alongside on its
+    own thread, queueing (frame, results, detection, now) for rendering.
+    
+    detection is None on frames the mapper's cadence skips.
+    """
+    rgb = None
+    small_buf = None
+    flip_bufs: list[np.ndarray | None] = [None] * _FLIP_RING_SIZE
+    slot = 0
+    # Both stages spend their time in native code, so they overlap; the
+    # single worker also serializes every detect() call on the mapper
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="apriltag") as tag_pool:
+        while not stop.is_set():
+            # Sleep until the receiver publishes a frame instead of spinning
+            # on get_latest() and re-processing the same one
+            if not receiver.wait_for_new_frame(timeout=0.1):
+                continue
+            frame, latency = receiver.get_latest()
+            if frame is None:
+                continue
+
+            # The receiver keeps handing out its own array, so flip into our buffer
+            buf = flip_bufs[slot]
+            if buf is None or buf.shape != frame.shape:
+                buf = flip_bufs[slot] = np.empty_like(frame)
+            frame = cv2.flip(frame, -1, dst=buf)
+            slot = (slot + 1) % _FLIP_RING_SIZE
+
+            now = time.monotonic()
+
+            tag_future = tag_pool.submit(mapper.detect, frame) if mapper.should_detect() else None
+
+            # Downscale for MediaPipe and convert to RGB, both into the previous
+            # frame's buffers when the size matches
+            small = inference_frame(frame, small_buf)
+            if small is not frame:
+                small_buf = small
+            if rgb is None or rgb.shape != small.shape:
+                rgb = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
+            else:
+                rgb.flags.writeable = True
+                cv2.cvtColor(small, cv2.COLOR_BGR2RGB, dst=rgb)
+            rgb.flags.writeable = False
+            results = hands.process(rgb)
+
+            detection = tag_future.result() if tag_future is not None else None
+
+            # Block while the render stage is behind, but keep checking for shutdown
+            while not stop.is_set():
+                try:
+                    render_q.put((frame, results, detection, now), timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
 
 
 def run_integrated_tracker(
@@ -266,7 +339,7 @@ def run_integrated_tracker(
 
     # Screen mapping
     mapper = MultiScreenMapper()
-    receiver = LowLatencyReceiver(PORT, wide_angle_crop=False)
+    receiver = LowLatencyReceiver(PORT, wide_angle_crop=False, pin_threads=True)
 
     # Backend service for UDP
     with GestureBackendService(
@@ -278,70 +351,89 @@ def run_integrated_tracker(
     ) as backend, mp_hands.Hands(
         static_image_mode=False,
         max_num_hands=MAX_NUM_HANDS,
-        model_complexity=1,
+        model_complexity=MODEL_COMPLEXITY,
         min_detection_confidence=0.5,
         min_tracking_confidence=0.5,
     ) as hands, TrackerDisplay() as display:
 
-        while True:
-
-            frame, latency = receiver.get_latest()
-            if frame is None:
-                continue
-
-            frame = cv2.flip(frame,-1)
-
-            if PROCESS_FLIP:
-                frame = cv2.flip(frame, 1)
-
-            now = time.time()
-
-            # Update screen mapper (AprilTag detection)
-            mapper.update(frame)
+        # Stage 1 (worker thread): frame fetch + MediaPipe, AprilTags in parallel.
+        # Stage 2 (this thread, which owns the GUI): gestures, mapping, drawing.
+        render_q: queue.Queue = queue.Queue(maxsize=RENDER_QUEUE_SIZE)
+        stop = threading.Event()
+        off_screen_frames = 0
+        worker = threading.Thread(
+            target=_inference_worker, args=(receiver, hands, mapper, render_q, stop), daemon=True
+        )
+        worker.start()
+
+        try:
+            while True:
+                try:
+                    frame, results, detection, now = render_q.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+
+                # Screen states are only written here, so drawing never sees a
+                # half-updated mapper
+                if detection is not None:
+                    mapper.apply(detection)
+
+                # Get gesture detection results
+                gesture_data = process_hands(
+                    frame, results, states, clap_detector, stretch_detector, now
+                )
 
-            # Process hands with MediaPipe
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            rgb.flags.writeable = False
-            results = hands.process(rgb)
+                # Get active finger position for screen mapping (pointer or pinch),
+                # in the camera frame's coordinates where the tags were found
+                finger_pos = gesture_data.active_finger
+                if finger_pos:
+                    finger_pos = to_frame_px(finger_pos, frame.shape[1])
+                screen_result: ScreenResult | None = None
+
+                if finger_pos:
+                    screen_result = mapper.find_screen(*finger_pos)
+                    # Off every known screen for a while: the tags may have moved,
+                    # so scan the next frame
+                    if screen_result is None:
+                        off_screen_frames += 1
+                        if off_screen_frames == REDETECT_AFTER_MISSES:
+                            mapper.request_detect()
+                    else:
+                        off_screen_frames = 0
+                    if screen_result:
+                        gesture_data.overlay.append(
+                            f"Screen {screen_result.screen_idx}: "
+                            f"({screen_result.rel_x:.3f}, {screen_result.rel_y:.3f})"
+                        )
+                else:
+                    off_screen_frames = 0
+
+                # Send gesture data to UDP backend
+                backend.process_frame(
+                    detected=gesture_data.detected,
+                    screen_result=screen_result,
+                    clap_active=gesture_data.clap_active,
+                    stretch_active=gesture_data.stretch_active,
+                    stretch_cumulative=gesture_data.stretch_cumulative,
+                    swipe_detected=gesture_data.swipe_detected,
+                    swipe_direction=gesture_data.swipe_direction,
+                )
 
-            # Get gesture detection results
-            gesture_data = process_hands(
-                frame, results, states, clap_detector, stretch_detector, now
-            )
-
-            # Get active finger position for screen mapping (pointer or pinch)
-            finger_pos = get_active_finger(gesture_data.detected)
-            screen_result: ScreenResult | None = None
-
-            if finger_pos:
-                screen_result = mapper.find_screen(*finger_pos)
-                if screen_result:
-                    gesture_data.overlay.append(
-                        f"Screen {screen_result.screen_idx}: "
-                        f"({screen_result.rel_x:.3f}, {screen_result.rel_y:.3f})"
-                    )
-
-            # Send gesture data to UDP backend
-            backend.process_frame(
-                detected=gesture_data.detected,
-                screen_result=screen_result,
-                clap_active=gesture_data.clap_active,
-                stretch_active=gesture_data.stretch_active,
-                stretch_cumulative=gesture_data.stretch_cumulative,
-                swipe_detected=gesture_data.swipe_detected,
-                swipe_direction=gesture_data.swipe_direction,
-            )
-
-            # Render screen boundaries and finger marker
-            display.render(frame, mapper, finger_pos, screen_result)
-
-            # Display
-            display_frame = cv2.flip(frame, 1) if DISPLAY_FLIP else frame
-            _draw_overlay(display_frame, gesture_data.overlay)
-
-            key = display.show(display_frame)
-            if key in (ord("q"), 27):
-                break
+                # Render screen boundaries and finger marker
+                display.render(frame, mapper, finger_pos, screen_result)
+
+                # Display
+                # The frame is ours until the next get, so mirror it in place
+                display_frame = cv2.flip(frame, 1, dst=frame) if NET_FLIP else frame
+                draw_overlay(display_frame, gesture_data.overlay)
+
+                key = display.show(display_frame)
+                if key in (ord("q"), 27):
+                    break
+        finally:
+            stop.set()
+            worker.join(timeout=1.0)
+            receiver.stop()
 
     cap.release()
     cv2.destroyAllWindows()
@@ -9,6 +9,7 @@ Example setup with 2 monitors:
     Screen 1 (right): Tags 4, 5, 6, 7
 """
 
+import os
 from dataclasses import dataclass, field
 from typing import Optional
 
@@ -16,6 +17,24 @@ import cv2
 import numpy as np
 from pupil_apriltags import Detector
 
+# Frames wider than this are downscaled before tag detection; tag16h5
+# tags still decode reliably at this width (0 disables)
+DETECT_WIDTH = 640
+
+# Screens don't move, so update() only re-detects every few frames
+DETECT_INTERVAL = 5
+
+# Half the cores, leaving the rest to hand tracking
+DETECT_THREADS = max(1, (os.cpu_count() or 2) // 2)
+
+# Debug-view color per screen, cycled by screen index
+DEBUG_COLORS = (
+    (0, 255, 0),    # Green
+    (255, 165, 0),  # Orange
+    (255, 0, 255),  # Magenta
+    (0, 255, 255),  # Cyan
+)
+
 
 @dataclass
 class ScreenRegion:
@@ -74,8 +93,20 @@ class ScreenState:
     region: ScreenRegion
     homography: Optional[np.ndarray] = None
     inverse_homography: Optional[np.ndarray] = None
-    tag_centers: dict[int, np.ndarray] = field(default_factory=dict)
+    # Tag centers in tag_ids order, with a flag for each tag seen in the last detection
+    corner_xy: np.ndarray = field(default_factory=lambda: np.zeros((4, 2), np.float32))
+    corner_present: np.ndarray = field(default_factory=lambda: np.zeros(4, bool))
     calibrated: bool = False
+    color: tuple[int, int, int] = DEBUG_COLORS[0]
+
+    @property
+    def tag_centers(self) -> dict[int, np.ndarray]:
+        """Detected tag centers keyed by tag ID."""
+        return {
+            tid: self.corner_xy[ci]
+            for ci, tid in enumerate(self.region.tag_ids)
+            if self.corner_present[ci]
+        }
 
     @property
     def screen_corners(self) -> np.ndarray:
@@ -94,11 +125,23 @@ class MultiScreenMapper:
     coordinates to the appropriate screen.
     """
 
-    def __init__(self, config: MultiScreenConfig):
+    def __init__(
+        self,
+        config: MultiScreenConfig,
+        detect_width: int = DETECT_WIDTH,
+        detect_interval: int = DETECT_INTERVAL,
+    ):
         self.config = config
+        self.detect_width = detect_width
+        self._detect_interval = max(1, detect_interval)
+        self._frame_counter = 0
+        # Set when a screen loses calibration, to re-detect on the next frame
+        self._calibration_lost = False
         self.detector = Detector(
             families="tag16h5",
-            nthreads=4,
+            nthreads=DETECT_THREADS,
+            # The frame is already downscaled to detect_width, so decimating
+            # quads further would lose the smaller tags
             quad_decimate=1.0,
             quad_sigma=0.0,
             refine_edges=True,
@@ -107,33 +150,79 @@ class MultiScreenMapper:
         
         # Initialize state for each screen
         self.screens: list[ScreenState] = [
-            ScreenState(region=region) for region in config.screens
+            ScreenState(region=region, color=DEBUG_COLORS[idx % len(DEBUG_COLORS)])
+            for idx, region in enumerate(config.screens)
         ]
         
-        # Map tag_id -> screen index for quick lookup
-        self._tag_to_screen: dict[int, int] = {}
+        # Corner arrays for all screens in one block; each ScreenState holds
+        # views of its own rows, so detections can be scattered in one step
+        self._corner_xy = np.zeros((len(self.screens), 4, 2), dtype=np.float32)
+        self._corner_present = np.zeros((len(self.screens), 4), dtype=bool)
+        for idx, screen in enumerate(self.screens):
+            screen.corner_xy = self._corner_xy[idx]
+            screen.corner_present = self._corner_present[idx]
+
+        # Lookup tables indexed by tag_id: screen index (-1 if unused) and corner index
+        max_id = max((tid for region in config.screens for tid in region.tag_ids), default=-1)
+        self._tag_screen_lut = np.full(max_id + 1, -1, dtype=np.int8)
+        self._tag_corner_lut = np.zeros(max_id + 1, dtype=np.int8)
         for idx, region in enumerate(config.screens):
-            for tag_id in region.tag_ids:
-                self._tag_to_screen[tag_id] = idx
+            for corner_idx, tag_id in enumerate(region.tag_ids):
+                self._tag_screen_lut[tag_id] = idx
+                self._tag_corner_lut[tag_id] = corner_idx
 
-    def detect_tags(self, frame: np.ndarray) -> dict[int, np.ndarray]:
-        """Detect all AprilTags in frame."""
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        detections = self.detector.detect(gray)
+        # Homographies of calibrated screens stacked as (N, 3, 3) with their
+        # (width, height) bounds, rebuilt whenever calibration changes
+        self._H_stack: Optional[np.ndarray] = None
+        self._screen_bounds = np.empty((0, 2))
+        self._stack_screens: list[ScreenState] = []
 
-        all_centers = {}
-        for det in detections:
-            if det.tag_id in self._tag_to_screen:
-                all_centers[det.tag_id] = np.array(det.center, dtype=np.float32)
+        # Grayscale / downscaled buffers reused between frames
+        self._gray_buf: Optional[np.ndarray] = None
+        self._small_buf: Optional[np.ndarray] = None
 
-        # Distribute to screens
-        for screen in self.screens:
-            screen.tag_centers = {
-                tid: all_centers[tid]
-                for tid in screen.region.tag_ids
-                if tid in all_centers
-            }
+    def detect_tags(self, frame: np.ndarray) -> dict[int, np.ndarray]:
+        """
+        Detect all AprilTags in frame.
+        
+        The returned centers are views into the screens' corner_xy arrays
+        and are overwritten by the next detection.
+        """
+        h, w = frame.shape[:2]
+        if self._gray_buf is None or self._gray_buf.shape != (h, w):
+            self._gray_buf = np.empty((h, w), dtype=np.uint8)
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray_buf)
+
+        # Detect on a downscaled copy, then scale centers back to frame pixels
+        scale = np.ones(2, dtype=np.float32)
+        if self.detect_width and w > self.detect_width:
+            small_size = (self.detect_width, round(h * self.detect_width / w))
+            if self._small_buf is None or self._small_buf.shape[::-1] != small_size:
+                self._small_buf = np.empty(small_size[::-1], dtype=np.uint8)
+            gray = cv2.resize(gray, small_size, dst=self._small_buf, interpolation=cv2.INTER_AREA)
+            scale[:] = (w / small_size[0], h / small_size[1])
 
+        detections = self.detector.detect(gray)
+
+        # Look up every detection's (screen, corner) slot at once and
+        # scatter the scaled centers into the corner arrays
+        self._corner_present[:] = False
+        ids = np.fromiter((det.tag_id for det in detections), dtype=np.intp, count=len(detections))
+        known = ids < len(self._tag_screen_lut)
+        known[known] = self._tag_screen_lut[ids[known]] >= 0
+        if not known.any():
+            return {}
+        ids = ids[known]
+        screen_idx = self._tag_screen_lut[ids]
+        corner_idx = self._tag_corner_lut[ids]
+        centers = np.array([det.center for det, k in zip(detections, known) if k], dtype=np.float32)
+        self._corner_xy[screen_idx, corner_idx] = centers * scale
+        self._corner_present[screen_idx, corner_idx] = True
+
+        all_centers = {
+            tid: self.screens[si].corner_xy[ci]
+            for tid, si, ci in zip(ids.tolist(), screen_idx.tolist(), corner_idx.tolist())
+        }
         return all_centers
 
     def compute_homographies(self) -> int:
@@ -144,30 +233,74 @@ class MultiScreenMapper:
             Number of screens successfully calibrated
         """
         calibrated_count = 0
+        was_calibrated = [screen.calibrated for screen in self.screens]
 
         for screen in self.screens:
             # Check if all 4 tags detected
-            if not all(tid in screen.tag_centers for tid in screen.region.tag_ids):
+            if not screen.corner_present.all():
                 screen.calibrated = False
                 continue
 
-            # Source points from camera
-            src_points = np.array([
-                screen.tag_centers[tid] for tid in screen.region.tag_ids
-            ], dtype=np.float32)
-
-            # Compute homography
-            screen.homography, _ = cv2.findHomography(src_points, screen.screen_corners)
+            # Exactly 4 points, so solve the homography directly (no RANSAC)
+            homography = cv2.getPerspectiveTransform(screen.corner_xy, screen.screen_corners)
 
-            if screen.homography is not None:
-                screen.inverse_homography = np.linalg.inv(screen.homography)
+            # A singular result means degenerate (e.g. collinear) tag centers
+            ok, inverse = cv2.invert(homography, flags=cv2.DECOMP_LU)
+            if ok:
+                screen.homography = homography
+                screen.inverse_homography = inverse
                 screen.calibrated = True
                 calibrated_count += 1
             else:
+                screen.homography = None
                 screen.calibrated = False
 
+        self._calibration_lost = any(
+            was and not screen.calibrated for was, screen in zip(was_calibrated, self.screens)
+        )
+        self._rebuild_stack()
         return calibrated_count
 
+    def update(self, frame: np.ndarray, compute: bool = True) -> bool:
+        """
+        Detect tags and recompute homographies, rate-limited.
+        
+        Runs every detect_interval calls, and on every call while no screen
+        is calibrated or right after a screen lost calibration. In between,
+        the cached homographies are reused.
+        
+        Args:
+            compute: If False, only detect tags (calibration locked)
+        
+        Returns:
+            True if detection ran on this frame
+        """
+        due = (
+            self._frame_counter % self._detect_interval == 0
+            or self._calibration_lost
+            or self._H_stack is None
+        )
+        self._frame_counter += 1
+        if not due:
+            return False
+
+        self.detect_tags(frame)
+        if compute:
+            self.compute_homographies()
+        return True
+
+    def _rebuild_stack(self) -> None:
+        """Stack calibrated homographies for batched point mapping."""
+        self._stack_screens = [screen for screen in self.screens if screen.calibrated]
+        if not self._stack_screens:
+            self._H_stack = None
+            return
+        self._H_stack = np.stack([screen.homography for screen in self._stack_screens])
+        self._screen_bounds = np.array(
+            [(screen.region.width, screen.region.height) for screen in self._stack_screens],
+            dtype=np.float64,
+        )
+
     def camera_to_screen(
         self,
         point: tuple[float, float],
@@ -179,75 +312,69 @@ class MultiScreenMapper:
             Tuple of (screen_name, local_x, local_y, global_x, global_y)
             or None if point isn't on any calibrated screen.
         """
-        for screen in self.screens:
-            if not screen.calibrated:
-                continue
-
-            # Transform point
-            pt = np.array([[point[0], point[1], 1.0]], dtype=np.float32).T
-            transformed = screen.homography @ pt
-            
-            w = transformed[2, 0]
-            if abs(w) < 1e-10:
-                continue
-
-            local_x = transformed[0, 0] / w
-            local_y = transformed[1, 0] / w
-
-            # Check if point is within this screen's bounds
-            if 0 <= local_x < screen.region.width and 0 <= local_y < screen.region.height:
-                global_x = int(local_x) + screen.region.offset_x
-                global_y = int(local_y) + screen.region.offset_y
-                return (
-                    screen.region.name,
-                    int(local_x),
-                    int(local_y),
-                    global_x,
-                    global_y,
-                )
-
-        return None
+        if self._H_stack is None:
+            return None
+
+        # Transform the point by every calibrated screen at once
+        transformed = self._H_stack @ np.array([point[0], point[1], 1.0])
+        w = transformed[:, 2]
+        valid = np.abs(w) >= 1e-10
+        with np.errstate(divide="ignore", invalid="ignore"):
+            local = transformed[:, :2] / w[:, None]
+
+        # First screen whose bounds contain the point
+        hits = valid & np.all((local >= 0) & (local < self._screen_bounds), axis=1)
+        if not hits.any():
+            return None
+        idx = int(np.argmax(hits))
+
+        screen = self._stack_screens[idx]
+        local_x, local_y = int(local[idx, 0]), int(local[idx, 1])
+        return (
+            screen.region.name,
+            local_x,
+            local_y,
+            local_x + screen.region.offset_x,
+            local_y + screen.region.offset_y,
+        )
 
     def get_calibration_status(self) -> dict[str, bool]:
         """Get calibration status for each screen."""
         return {screen.region.name: screen.calibrated for screen in self.screens}
 
-    def draw_debug(self, frame: np.ndarray) -> np.ndarray:
-        """Draw debug visualization."""
-        debug_frame = frame.copy()
-
-        colors = [
-            (0, 255, 0),    # Green
-            (255, 165, 0),  # Orange
-            (255, 0, 255),  # Magenta
-            (0, 255, 255),  # Cyan
-        ]
-
+    def draw_debug_inplace(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Draw debug visualization directly on frame and return it.
+        
+        Copy the frame first if the undrawn image is still needed.
+        """
         for idx, screen in enumerate(self.screens):
-            color = colors[idx % len(colors)]
+            color = screen.color
 
             # Draw tag centers
-            for tag_id, center in screen.tag_centers.items():
+            for tag_id, present, center in zip(
+                screen.region.tag_ids, screen.corner_present, screen.corner_xy
+            ):
+                if not present:
+                    continue
                 cx, cy = int(center[0]), int(center[1])
-                cv2.circle(debug_frame, (cx, cy), 10, color, -1)
+                cv2.circle(frame, (cx, cy), 10, color, -1)
                 cv2.putText(
-                    debug_frame, f"{tag_id}",
+                    frame, f"{tag_id}",
                     (cx + 12, cy + 5), cv2.FONT_HERSHEY_SIMPLEX,
                     0.5, color, 2
                 )
 
             # Draw quadrilateral if all 4 tags detected
-            if len(screen.tag_centers) == 4:
-                pts = np.array([
-                    screen.tag_centers[tid] for tid in screen.region.tag_ids
-                ], dtype=np.int32)
-                cv2.polylines(debug_frame, [pts], True, color, 2)
+            if screen.corner_present.all():
+                pts = screen.corner_xy.astype(np.int32)
+                cv2.polylines(frame, [pts], True, color, 2)
 
             # Status text
             status = "OK" if screen.calibrated else "..."
             y_offset = 30 + idx * 25
             cv2.putText(
-                debug_frame,
+                frame,
                 f"{screen.region.name}: {status}",
                 (10, y_offset),
                 cv2.FONT_HERSHEY_SIMPLEX,
@@ -256,7 +383,7 @@ class MultiScreenMapper:
                 2,
             )
 
-        return debug_frame
+        return frame
 
 
 def run_demo(camera_index: int = 0, layout: str = "dual_horizontal"):
@@ -306,12 +433,9 @@ def run_demo(camera_index: int = 0, layout: str = "dual_horizontal"):
         if not ret:
             break
 
-        mapper.detect_tags(frame)
-
-        if not calibration_locked:
-            mapper.compute_homographies()
+        mapper.update(frame, compute=not calibration_locked)
 
-        debug_frame = mapper.draw_debug(frame)
+        debug_frame = mapper.draw_debug_inplace(frame)
 
         # Show mouse mapping
         if mouse_pos:
@@ -1,12 +1,37 @@
+import ctypes
 import cv2
+import functools
+import inspect
+import os
+import select
 import socket
+import sys
 import numpy as np
 import struct
 import time
 import threading
-from typing import Dict, Optional, Tuple, TypedDict, Union
+from typing import List, Optional, Tuple, TypedDict, Union
 from dataclasses import dataclass
 
+# 可选：NVIDIA GPU 上用 nvJPEG (pynvjpeg) 解码，释放 CPU 给接收线程
+# 解码器会初始化 CUDA，所以到创建接收器时才实例化 (见 _init_nv_jpeg)
+try:
+    from nvjpeg import NvJpeg
+except ImportError:
+    NvJpeg = None
+_nv_jpeg = None
+_nv_jpeg_tried = False
+
+# 可选：libjpeg-turbo (PyTurboJPEG) 解码更快，不可用时回退到 cv2.imdecode
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    _turbo_jpeg = TurboJPEG()
+    # 较新的 PyTurboJPEG 可以解码到预分配的数组 (dst)
+    _TURBO_DST = "dst" in inspect.signature(TurboJPEG.decode).parameters
+except (ImportError, OSError, RuntimeError):
+    _turbo_jpeg = None
+    _TURBO_DST = False
+
 
 # ==========================================
 # Part 1: 必要工具函数 (Utility Functions)
@@ -18,9 +43,24 @@ class FisheyeCalibration:
     D: np.ndarray
 
 
+@functools.lru_cache(maxsize=8)
+def _fisheye_maps(K_bytes: bytes, D_bytes: bytes, size: Tuple[int, int], new_size: Tuple[int, int],
+                  balance: float) -> Tuple[np.ndarray, np.ndarray]:
+    """按标定参数和尺寸缓存矫正映射表 (每帧只需 remap)"""
+    K = np.frombuffer(K_bytes, dtype=np.float64).reshape(3, 3)
+    D = np.frombuffer(D_bytes, dtype=np.float64).reshape(-1, 1)
+    new_K = cv2.fisheye.estimateNewCameraMatrixForUndistortRectify(K, D, size, np.eye(3), balance=balance,
+                                                                   new_size=new_size)
+    return cv2.fisheye.initUndistortRectifyMap(K, D, np.eye(3), new_K, new_size, cv2.CV_16SC2)
+
+
 def undistort_fisheye(frame_bgr: np.ndarray, calib: FisheyeCalibration, *, balance: float = 0.0,
-                      new_size: Optional[Tuple[int, int]] = None) -> np.ndarray:
-    """鱼眼畸变矫正 (如果需要使用，请在主循环中定义 K 和 D)"""
+                      new_size: Optional[Tuple[int, int]] = None,
+                      out: Optional[np.ndarray] = None) -> np.ndarray:
+    """鱼眼畸变矫正 (如果需要使用，请在主循环中定义 K 和 D)
+
+    传入上一帧的结果作为 out 时直接写入该缓冲区 (尺寸不符则新分配)
+    """
     h, w = frame_bgr.shape[:2]
     if new_size is None:
         new_w, new_h = w, h
@@ -28,24 +68,77 @@ def undistort_fisheye(frame_bgr: np.ndarray, calib: FisheyeCalibration, *, balan
         new_w, new_h = new_size
     K = np.asarray(calib.K, dtype=np.float64)
     D = np.asarray(calib.D, dtype=np.float64).reshape(-1, 1)
-    new_K = cv2.fisheye.estimateNewCameraMatrixForUndistortRectify(K, D, (w, h), np.eye(3), balance=balance,
-                                                                   new_size=(new_w, new_h))
-    map1, map2 = cv2.fisheye.initUndistortRectifyMap(K, D, np.eye(3), new_K, (new_w, new_h), cv2.CV_16SC2)
-    return cv2.remap(frame_bgr, map1, map2, interpolation=cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT)
+    map1, map2 = _fisheye_maps(K.tobytes(), D.tobytes(), (w, h), (new_w, new_h), balance)
+    if out is not None and out.shape != (new_h, new_w) + frame_bgr.shape[2:]:
+        out = None
+    return cv2.remap(frame_bgr, map1, map2, interpolation=cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT,
+                     dst=out)
+
+
+@functools.lru_cache(maxsize=4)
+def _fov_slice(w: int, target_hfov_deg: float, original_hfov_deg: float) -> slice:
+    """按宽度和视场角缓存裁剪列范围"""
+    scale = target_hfov_deg / original_hfov_deg
+    keep_w = max(1, min(w, int(w * scale)))
+    x0 = (w - keep_w) // 2
+    return slice(x0, x0 + keep_w)
 
 
 def approximate_fov_crop(frame_bgr: np.ndarray, target_hfov_deg: float, *,
                          original_hfov_deg: float = 160.0) -> np.ndarray:
-    """线性广角裁剪 (防止竖条问题)"""
+    """线性广角裁剪 (防止竖条问题)，返回视图不拷贝"""
     if target_hfov_deg <= 0 or target_hfov_deg >= original_hfov_deg:
         return frame_bgr
+    return frame_bgr[:, _fov_slice(frame_bgr.shape[1], target_hfov_deg, original_hfov_deg)]
 
-    h, w = frame_bgr.shape[:2]
-    scale = target_hfov_deg / original_hfov_deg
-    keep_w = int(w * scale)
-    keep_w = max(1, min(w, keep_w))
-    x0 = (w - keep_w) // 2
-    return frame_bgr[:, x0:x0 + keep_w]
+
+# 解码时按 1/reduce 缩小 (libjpeg 在 IDCT 阶段直接缩放) 对应的 OpenCV 标志
+_IMREAD_REDUCED = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+
+def _init_nv_jpeg():
+    """首次调用时创建 nvJPEG 解码器；未安装或无可用 CUDA 设备时保持 None"""
+    global _nv_jpeg, _nv_jpeg_tried
+    if _nv_jpeg_tried or NvJpeg is None:
+        return
+    _nv_jpeg_tried = True
+    try:
+        _nv_jpeg = NvJpeg()
+    except (OSError, RuntimeError):
+        _nv_jpeg = None
+
+
+def _decode_jpeg(data, reduce: int = 1, dst: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+    """
+    JPEG 解码为 BGR (依次尝试 nvJPEG GPU 解码、TurboJPEG SIMD 解码，最后回退到 OpenCV)。
+    reduce 为 2/4/8 时在解码中直接输出 1/reduce 尺寸，省掉全分辨率 IDCT 和之后的 resize。
+    dst 为形状匹配的预分配数组时 TurboJPEG 直接解码进去；其他解码器忽略 dst，返回新数组。
+    """
+    if _nv_jpeg is not None and reduce == 1:
+        try:
+            frame = _nv_jpeg.decode(bytes(data))
+            if frame is not None:
+                return frame
+        except Exception:
+            pass
+    if _turbo_jpeg is not None:
+        try:
+            # 直接读取拼帧缓冲区，无需先拷贝为 bytes
+            kwargs = {"dst": dst} if dst is not None and _TURBO_DST else {}
+            if reduce != 1:
+                kwargs["scaling_factor"] = (1, reduce)
+            return _turbo_jpeg.decode(data, pixel_format=TJPF_BGR, **kwargs)
+        except Exception:
+            pass
+    # OpenCV C++底层解码 (拼帧缓冲区本身就是 uint8 数组，直接传入)
+    if not isinstance(data, np.ndarray):
+        data = np.frombuffer(data, np.uint8)
+    return cv2.imdecode(data, _IMREAD_REDUCED[reduce])
 
 
 # ==========================================
@@ -54,165 +147,523 @@ def approximate_fov_crop(frame_bgr: np.ndarray, target_hfov_deg: float, *,
 
 PORT = 9999
 
+# 分片头: 探针模式 (double 时间戳 + 3 bytes) / 普通模式 (3 bytes)
+# 3 个单字节字段直接按下标读取，只有时间戳走预编译的 struct
+_PROBE_TS = struct.Struct("<d")
+_PROBE_HEADER_SIZE = _PROBE_TS.size + 3
+_HEADER_SIZE = 3
+
 
 class FrameBuffer(TypedDict):
-    chunks: Dict[int, bytes]
+    buf: Optional[np.ndarray]  # uint8，非末尾分片按固定步长写入
+    chunk_size: int
+    tail: Optional[bytes]  # 步长未知时先到的末尾分片 (可能较短)
+    tail_len: int
+    received: int  # 已收分片位图
     total: int
+    full_mask: int  # 全部分片到齐时的位图
     probe_ts: float
     create_time: float
+    gen: int  # 所属拼帧代数，旧代的槽位视为空
+
+
+# 超过该时长仍未拼完的帧视为陈旧
+STALE_FRAME_S = 0.5
+
+
+class _FrameSlots:
+    """
+    按 frame_id (uint8) 直接索引的 256 槽拼帧表，取代 dict。
+    清空 = 代数 +1 (O(1))；超时按粗粒度时钟在访问槽位时判断，无需扫描。
+    """
+    __slots__ = ("slots", "gen", "now")
+
+    def __init__(self):
+        self.slots: List[Optional[FrameBuffer]] = [None] * 256
+        self.gen = 0
+        self.now = time.monotonic()
+
+    def clear(self):
+        self.gen += 1
+
+    def tick(self):
+        self.now = time.monotonic()
+
+
+# 4MB receive buffer to prevent packet loss at system level
+RCVBUF_SIZE = 4 * 1024 * 1024
+
+# Linux 专用选项 (其他平台上 socket 模块可能没有这个常量)
+_SO_RCVBUFFORCE = getattr(socket, "SO_RCVBUFFORCE", 33)
+
+
+# ------------------------------------------
+# recvmmsg(2) 批量收包 (仅 Linux，经 ctypes 调用 libc)
+# ------------------------------------------
+
+class _IOVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_IOVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _MsgHdr), ("msg_len", ctypes.c_uint)]
+
+
+_MSG_DONTWAIT = 0x40
+
+_recvmmsg = None
+if sys.platform.startswith("linux"):
+    try:
+        _recvmmsg = ctypes.CDLL(None, use_errno=True).recvmmsg
+        _recvmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int, ctypes.c_void_p]
+        _recvmmsg.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        _recvmmsg = None
+
+
+class _BatchReceiver:
+    """一次系统调用取最多 batch 个数据报，写入同一块预分配的接收区"""
+
+    def __init__(self, batch: int = 32, packet_size: int = 65536):
+        self.batch = batch
+        self.packet_size = packet_size
+        self.scratch = bytearray(batch * packet_size)
+        self.view = memoryview(self.scratch)
+        # 持有 ctypes 视图，保证接收区地址在整个生命周期内有效
+        self._raw = (ctypes.c_char * len(self.scratch)).from_buffer(self.scratch)
+        base = ctypes.addressof(self._raw)
+        self._iov = (_IOVec * batch)()
+        self._msgs = (_MMsgHdr * batch)()
+        for i in range(batch):
+            self._iov[i].iov_base = base + i * packet_size
+            self._iov[i].iov_len = packet_size
+            self._msgs[i].msg_hdr.msg_iov = ctypes.pointer(self._iov[i])
+            self._msgs[i].msg_hdr.msg_iovlen = 1
+
+    def recv(self, fd: int) -> int:
+        """非阻塞收包，返回收到的数据报个数 (无数据时为 0)"""
+        n = _recvmmsg(fd, self._msgs, self.batch, _MSG_DONTWAIT, None)
+        return n if n > 0 else 0
+
+    def packet(self, i: int) -> memoryview:
+        start = i * self.packet_size
+        return self.view[start:start + self._msgs[i].msg_len]
+
+
+def create_udp_socket(port: int = PORT) -> socket.socket:
+    """创建接收 socket：SO_REUSEPORT 允许多个 socket 绑定同一端口，并尽量争取大接收缓冲区"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    # Allow reuse of address/port even if in TIME_WAIT state
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if hasattr(socket, "SO_REUSEPORT"):
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind(('0.0.0.0', port))
+
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RCVBUF_SIZE)
+    # Linux 会把 SO_RCVBUF 截断到 net.core.rmem_max，有 CAP_NET_ADMIN 时用 SO_RCVBUFFORCE 绕过
+    if sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF) < RCVBUF_SIZE and sys.platform.startswith("linux"):
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, _SO_RCVBUFFORCE, RCVBUF_SIZE)
+        except OSError:
+            pass
+    actual = sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+    if actual < RCVBUF_SIZE:
+        print(f"⚠️ 接收缓冲区只有 {actual // 1024} KB (请求 {RCVBUF_SIZE // 1024} KB)，"
+              f"高码率时可能丢包；可调大 net.core.rmem_max")
+    return sock
+
+
+# ------------------------------------------
+# 绑核：接收/解码线程独占核心，避免与 MediaPipe / OpenCV 线程池抢占造成延迟抖动
+# ------------------------------------------
+
+# 至少给推理和主线程留下的核心数，核心不够时不绑核
+_MIN_SHARED_CORES = 2
+# 接收线程的 SCHED_FIFO 优先级 (需要 root 或 CAP_SYS_NICE，否则保持普通调度)
+_RT_PRIORITY = 10
+
+
+def _reserve_cores(count: int) -> Optional[List[int]]:
+    """从当前可用核心中挑出 count 个专用核心；不支持或核心不足时返回 None"""
+    if not hasattr(os, "sched_getaffinity"):
+        return None
+    cores = sorted(os.sched_getaffinity(0))
+    if len(cores) < count + _MIN_SHARED_CORES:
+        return None
+    return cores[:count]
+
+
+def _pin_current_thread(cpu: int, realtime: bool = False):
+    """把调用线程绑到 cpu 上 (Linux)，realtime=True 时再尝试提升为 SCHED_FIFO"""
+    try:
+        os.sched_setaffinity(0, {cpu})
+    except OSError:
+        return
+    if realtime:
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(_RT_PRIORITY))
+        except (OSError, AttributeError):
+            pass
 
 
 class LowLatencyReceiver:
-    def __init__(self, port: int = PORT, wide_angle_crop: bool = False):
-        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        # Allow reuse of address/port even if in TIME_WAIT state
-        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.sock.bind(('0.0.0.0', port))
-        # 4MB receive buffer to prevent packet loss at system level
-        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+    def __init__(self, port: int = PORT, wide_angle_crop: bool = False, num_workers: int = 1,
+                 max_width: Optional[int] = None, pin_threads: bool = False):
+        """
+        max_width: 只用于显示时设置；源图宽于此值则在解码时按 1/2、1/4、1/8 缩小，
+        直到不超过 max_width。需要全分辨率的跟踪流程保持 None。
+
+        pin_threads: Linux 上核心足够时，每个接收线程和解码线程各独占一个核心，
+        调用线程 (以及之后由它创建的 MediaPipe / OpenCV 线程) 让出这些核心，
+        stop() 时恢复调用线程原来的亲和性 (应在同一线程调用 stop)。
+
+        num_workers > 1 时每个线程各开一个 SO_REUSEPORT socket 绑定同一端口。
+        内核按数据流 (源地址/端口) 分配数据包，所以多个发送端时才能分摊负载；
+        同一发送端的包总是落在同一个 socket，拼帧不会跨线程。
+        """
+        if num_workers > 1 and not hasattr(socket, "SO_REUSEPORT"):
+            num_workers = 1
+        self.socks = [create_udp_socket(port) for _ in range(max(1, num_workers))]
+        self.sock = self.socks[0]
 
         # 共享数据: (图像帧, 延迟ms)
         self.latest_bundle: Optional[Tuple[np.ndarray, float]] = None
         self.lock = threading.Lock()
+
+        # 三缓冲：解码线程写入的槽位既不是最新发布的，也不是消费者正持有的，
+        # 所以消费者拿到的帧在下一次 get_latest 之前不会被改写，无需拷贝。
+        # lock 只保护两个下标和 latest_bundle，从不跨越解码或拷贝。
+        self._frame_slots: List[Optional[np.ndarray]] = [None] * 3
+        self._published_slot = -1
+        self._reading_slot = -1
+        # 每发布一帧置位，消费者据此等待新帧而不是轮询
+        self._new_frame = threading.Event()
         self.running = True
 
         # 配置
         self.wide_angle_crop = wide_angle_crop
-
-        # 启动后台接收线程
-        self.thread = threading.Thread(target=self._receive_worker)
-        self.thread.daemon = True
-        self.thread.start()
-        print(f"🚀 低延迟接收线程已启动 (端口 {port})")
-
-    def _receive_worker(self):
+        self.max_width = max_width
+
+        # 接收线程交给解码线程的最新完整 JPEG: (数据, 探针时间戳)
+        self._latest_jpeg: Optional[Tuple[Union[bytes, np.ndarray], float]] = None
+        self._jpeg_ready = threading.Condition()
+
+        _init_nv_jpeg()
+
+        # 专用核心: 前 len(socks) 个给接收线程，最后一个给解码线程
+        cores = _reserve_cores(len(self.socks) + 1) if pin_threads else None
+        # 调用线程原来的核心集合，stop() 时恢复
+        self._caller_affinity = os.sched_getaffinity(0) if cores else None
+
+        # 解码线程：只解码最新的一帧，接收线程从不等待解码
+        self.decode_thread = threading.Thread(
+            target=self._decode_worker, args=(cores[-1] if cores else None,), daemon=True
+        )
+        self.decode_thread.start()
+
+        # 启动后台接收线程 (每个 socket 一个)
+        self.threads = [
+            threading.Thread(
+                target=self._receive_worker, args=(sock, cores[i] if cores else None), daemon=True
+            )
+            for i, sock in enumerate(self.socks)
+        ]
+        self.thread = self.threads[0]
+        for thread in self.threads:
+            thread.start()
+        if cores:
+            os.sched_setaffinity(0, self._caller_affinity - set(cores))
+        print(f"🚀 低延迟接收线程已启动 (端口 {port}, {len(self.threads)} 个线程)")
+
+    def _receive_worker(self, sock: socket.socket, cpu: Optional[int] = None):
         """
         后台线程工作逻辑：
         1. 循环收包
         2. 解析探针 (Probe)
-        3. 拼包 & 解码
-        4. 执行裁剪 (可选)
-        5. 更新最新帧 (丢弃旧帧)
+        3. 拼包，把完整的 JPEG 交给解码线程 (丢弃旧帧)
         """
-        buffer: Dict[int, FrameBuffer] = {}
+        if cpu is not None:
+            _pin_current_thread(cpu, realtime=True)
+        buffer = _FrameSlots()
+
+        packet = bytearray(65536)
+        view = memoryview(packet)
+        sock.setblocking(False)
+        # Linux 上用 recvmmsg 一次系统调用取一批包 (一帧的分片通常成批到达)
+        batch = _BatchReceiver() if _recvmmsg is not None else None
+        # 每次唤醒和每 128 个包才读一次时钟 (判断超时用)，而不是每个包都读
+        packets = 0
 
         while self.running:
             try:
-                # 阻塞接收 (不会卡主界面)
-                data, _ = self.sock.recvfrom(65536)
-
-                # --- 协议头智能解析 ---
-                has_probe = False
-                ts = 0.0
-                frame_id = 0
-                packet_id = 0
-                total_packets = 0
-                payload = b''
-
-                # 尝试解析 11字节头 (探针模式: double + 3 bytes)
-                if len(data) >= 11:
+                # 等待数据到达 (不会卡主界面)，然后一次取空内核缓冲区，复用同一接收缓冲
+                readable, _, _ = select.select([sock], [], [], 0.5)
+                if not readable:
+                    continue
+                buffer.tick()
+                if batch is not None:
+                    while True:
+                        n = batch.recv(sock.fileno())
+                        if not n:
+                            break
+                        for i in range(n):
+                            self._handle_packet(batch.packet(i), buffer)
+                        packets += n
+                        if packets >= 128:
+                            packets = 0
+                            buffer.tick()
+                    continue
+                while True:
                     try:
-                        ts_val, fid, pid, total = struct.unpack("dBBB", data[:11])
-                        # 简单验证时间戳是否合理 (比如大于2020年的时间戳)
-                        if ts_val > 1600000000:
-                            ts = ts_val
-                            frame_id, packet_id, total_packets = fid, pid, total
-                            payload = data[11:]
-                            has_probe = True
-                    except:
-                        pass
-
-                # 如果不是探针，尝试解析 3字节头 (普通模式)
-                if not has_probe:
-                    if len(data) >= 3:
-                        frame_id, packet_id, total_packets = struct.unpack("BBB", data[:3])
-                        payload = data[3:]
-                    else:
-                        continue
-                # -----------------------
-
-                if frame_id not in buffer:
-                    buffer[frame_id] = {
-                        'chunks': {},
-                        'total': int(total_packets),
-                        'probe_ts': 0.0,
-                        'create_time': time.time()
-                    }
-
-                # 记录该帧的时间戳 (取收到的第一个带探针的包)
-                if has_probe and buffer[frame_id]['probe_ts'] == 0.0:
-                    buffer[frame_id]['probe_ts'] = ts
-
-                buffer[frame_id]['chunks'][int(packet_id)] = payload
-
-                # 检查帧是否完整
-                if len(buffer[frame_id]['chunks']) == buffer[frame_id]['total']:
-                    # 按顺序拼接
-                    sorted_chunks = [buffer[frame_id]['chunks'][i] for i in range(buffer[frame_id]['total']) if
-                                     i in buffer[frame_id]['chunks']]
-
-                    if len(sorted_chunks) == buffer[frame_id]['total']:
-                        full_data = b''.join(sorted_chunks)
-                        np_arr = np.frombuffer(full_data, np.uint8)
-
-                        # 解码 (OpenCV C++底层，速度极快)
-                        frame = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
-
-                        if frame is not None:
-                            # 1. 执行必要的功能：裁剪 (如果在主线程做会增加显示延迟，所以在这里做)
-                            if self.wide_angle_crop:
-                                frame = approximate_fov_crop(frame, target_hfov_deg=100.0, original_hfov_deg=160.0)
-
-                            # 2. 计算延迟
-                            latency = -1.0
-                            send_ts = buffer[frame_id]['probe_ts']
-                            if send_ts > 0.0:
-                                # 延迟 = 当前接收时间 - 发送时间
-                                latency = (time.time() - send_ts) * 1000.0
-
-                            # 3. 线程安全地更新最新帧
-                            with self.lock:
-                                self.latest_bundle = (frame, latency)
-
-                    # 激进清理：拼完一帧后清空 Buffer，防止积压
-                    buffer.clear()
-
-                # 垃圾回收：清理超过 0.5s 的陈旧数据
-                now = time.time()
-                to_del = [fid for fid in buffer if now - buffer[fid]['create_time'] > 0.5]
-                for fid in to_del: del buffer[fid]
+                        nbytes = sock.recv_into(packet)
+                    except BlockingIOError:
+                        break
+                    self._handle_packet(view[:nbytes], buffer)
+                    packets += 1
+                    if packets & 127 == 0:
+                        buffer.tick()
 
             except Exception:
                 continue
 
+    def _handle_packet(self, data: memoryview, buffer: _FrameSlots):
+        """解析单个分片并拼帧 (data 指向复用的接收缓冲区)"""
+        # --- 协议头智能解析 (先按长度分支，无异常控制流) ---
+        has_probe = False
+        ts = 0.0
+        n = len(data)
+
+        # 尝试解析 11字节头 (探针模式: double + 3 bytes)
+        if n >= _PROBE_HEADER_SIZE:
+            ts_val = _PROBE_TS.unpack_from(data)[0]
+            # 简单验证时间戳是否合理 (比如大于2020年的时间戳)
+            has_probe = ts_val > 1600000000
+
+        if has_probe:
+            ts = ts_val
+            frame_id = data[8]
+            packet_id = data[9]
+            total_packets = data[10]
+            hdr_len = _PROBE_HEADER_SIZE
+        elif n >= _HEADER_SIZE:
+            # 不是探针，按 3字节头解析 (普通模式)
+            frame_id = data[0]
+            packet_id = data[1]
+            total_packets = data[2]
+            hdr_len = _HEADER_SIZE
+        else:
+            return
+        # 负载只记 (data, hdr_len)，写入时才切片，丢弃的分片不产生任何切片对象
+        payload_len = n - hdr_len
+        # -----------------------
+
+        # 空槽、上一代遗留或已超时的槽位都重新开始拼帧
+        entry = buffer.slots[frame_id]
+        if entry is None or entry['gen'] != buffer.gen or buffer.now - entry['create_time'] > STALE_FRAME_S:
+            entry = buffer.slots[frame_id] = {
+                'buf': None,
+                'chunk_size': 0,
+                'tail': None,
+                'tail_len': 0,
+                'received': 0,
+                'total': int(total_packets),
+                'full_mask': (1 << total_packets) - 1,
+                'probe_ts': 0.0,
+                'create_time': buffer.now,
+                'gen': buffer.gen,
+            }
+
+        # 记录该帧的时间戳 (取收到的第一个带探针的包)
+        if has_probe and entry['probe_ts'] == 0.0:
+            entry['probe_ts'] = ts
+
+        total = entry['total']
+        bit = 1 << packet_id
+        # 越界或重复的分片直接忽略
+        if packet_id >= total or entry['received'] & bit:
+            return
+
+        if packet_id == total - 1:
+            # 末尾分片可能较短：步长已知时直接写入，否则暂存到拼帧时
+            if entry['buf'] is not None:
+                # 末尾分片不可能比步长长，否则写入会越界：作废该帧
+                if payload_len > entry['chunk_size']:
+                    buffer.slots[frame_id] = None
+                    return
+                tail_start = packet_id * entry['chunk_size']
+                entry['buf'][tail_start:tail_start + payload_len] = data[hdr_len:]
+                entry['tail_len'] = payload_len
+            else:
+                entry['tail'] = bytes(data[hdr_len:])  # 接收缓冲区会被复用，需拷贝
+        else:
+            # 非末尾分片等长：首个分片决定步长，之后直接写入预分配缓冲区
+            if entry['buf'] is None:
+                entry['chunk_size'] = payload_len
+                entry['buf'] = np.empty(payload_len * total, np.uint8)
+            chunk_size = entry['chunk_size']
+            if payload_len != chunk_size:
+                buffer.slots[frame_id] = None
+                return
+            # memoryview 切片零拷贝，整段写入只做一次 memmove
+            entry['buf'][packet_id * chunk_size:(packet_id + 1) * chunk_size] = data[hdr_len:]
+        entry['received'] |= bit
+
+        # 检查帧是否完整 (位图全满)
+        if entry['received'] == entry['full_mask']:
+            tail = entry['tail']
+            if entry['buf'] is None:
+                full_data = tail
+            else:
+                tail_start = (total - 1) * entry['chunk_size']
+                if tail is not None:
+                    if len(tail) > entry['chunk_size']:
+                        buffer.slots[frame_id] = None
+                        return
+                    entry['buf'][tail_start:tail_start + len(tail)] = np.frombuffer(tail, np.uint8)
+                    entry['tail_len'] = len(tail)
+                full_data = entry['buf'][:tail_start + entry['tail_len']]
+
+            # 只交出最新的 JPEG，由解码线程处理 (来不及解码的旧帧直接被覆盖)
+            with self._jpeg_ready:
+                self._latest_jpeg = (full_data, entry['probe_ts'])
+                self._jpeg_ready.notify()
+
+            # 激进清理：拼完一帧后作废所有未完成的帧，防止积压
+            buffer.clear()
+
+    def _decode_worker(self, cpu: Optional[int] = None):
+        """解码线程：取最新的 JPEG，解码 + 裁剪 + 计算延迟后更新最新帧"""
+        if cpu is not None:
+            _pin_current_thread(cpu)
+        # 缩小倍数根据上一帧的源图宽度决定 (首帧按原尺寸解码)
+        reduce = 1
+        # 上一帧的解码尺寸，槽位形状一致时才让解码器直接写入
+        frame_shape = None
+        while self.running:
+            with self._jpeg_ready:
+                if self._latest_jpeg is None:
+                    self._jpeg_ready.wait(0.5)
+                latest, self._latest_jpeg = self._latest_jpeg, None
+            if latest is None:
+                continue
+            full_data, send_ts = latest
+
+            with self.lock:
+                slot = next(i for i in range(3) if i != self._published_slot and i != self._reading_slot)
+            dst = self._frame_slots[slot]
+            if dst is not None and dst.shape != frame_shape:
+                dst = None
+
+            frame = _decode_jpeg(full_data, reduce, dst)
+            if frame is None:
+                continue
+            # 不支持 dst 的解码器返回新数组，直接成为该槽位的缓冲区
+            self._frame_slots[slot] = frame
+            frame_shape = frame.shape
+            if self.max_width:
+                src_w = frame.shape[1] * reduce
+                prev_reduce, reduce = reduce, 1
+                while reduce < 8 and src_w > self.max_width * reduce:
+                    reduce *= 2
+                if reduce != prev_reduce:
+                    frame_shape = None
+
+            # 1. 执行必要的功能：裁剪 (如果在主线程做会增加显示延迟，所以在这里做)
+            if self.wide_angle_crop:
+                frame = approximate_fov_crop(frame, target_hfov_deg=100.0, original_hfov_deg=160.0)
+
+            # 2. 计算延迟
+            latency = -1.0
+            if send_ts > 0.0:
+                # 延迟 = 当前接收时间 - 发送时间 (发送端时间戳是墙上时钟，只能用 time.time 比较)
+                latency = (time.time() - send_ts) * 1000.0
+
+            # 3. 线程安全地发布最新帧 (只交换下标和引用)
+            with self.lock:
+                self._published_slot = slot
+                self.latest_bundle = (frame, latency)
+            self._new_frame.set()
+
     def get_latest(self) -> Tuple[Optional[np.ndarray], float]:
-        """主线程调用：获取当前最新的一帧"""
+        """
+        主线程调用：获取当前最新的一帧。
+        返回的帧在同一消费者下一次调用前保持不变 (只保护最后一个调用者)。
+        """
         with self.lock:
+            self._reading_slot = self._published_slot
             if self.latest_bundle:
                 return self.latest_bundle
             return None, -1.0
 
+    def wait_for_new_frame(self, timeout: Optional[float] = None) -> bool:
+        """
+        阻塞直到上次调用之后有新帧发布 (或超时)，返回是否有新帧。
+        之后调用 get_latest 取帧；只适用于单个消费者。
+        """
+        if not self._new_frame.wait(timeout):
+            return False
+        self._new_frame.clear()
+        return True
+
     def stop(self):
         self.running = False
-        self.sock.close()
+        self._new_frame.set()
+        with self._jpeg_ready:
+            self._jpeg_ready.notify_all()
+        for sock in self.socks:
+            sock.close()
+        if self._caller_affinity is not None:
+            try:
+                os.sched_setaffinity(0, self._caller_affinity)
+            except OSError:
+                pass
+            self._caller_affinity = None
 
 
 # ==========================================
 # Part 3: 主程序 (渲染与显示)
 # ==========================================
 
+# HUD 区域 (与原 rectangle (5,5)-(240,45) 一致，含端点)
+_HUD_Y0, _HUD_Y1, _HUD_X0, _HUD_X1 = 5, 46, 5, 241
+
+
+@functools.lru_cache(maxsize=1024)
+def _hud_tile(text: str, color: Tuple[int, int, int]) -> np.ndarray:
+    """预先渲染的 HUD 图块 (黑底 + 文字)；同样的文字只光栅化一次，之后按切片整块拷贝"""
+    tile = np.zeros((_HUD_Y1 - _HUD_Y0, _HUD_X1 - _HUD_X0, 3), np.uint8)
+    cv2.putText(tile, text, (15 - _HUD_X0, 35 - _HUD_Y0), cv2.FONT_HERSHEY_SIMPLEX,
+                0.8, color, 2)
+    return tile
+
+
 if __name__ == "__main__":
     # 初始化接收器
     # wide_angle_crop=False 表示保留全广角 (1640x1232 或 820x616)
-    receiver = LowLatencyReceiver(PORT, wide_angle_crop=False)
+    # 为了在电脑屏幕上看不撑满，宽于 1000 的画面 (1640x1232) 在解码时直接缩小一半；820x616 原样显示
+    receiver = LowLatencyReceiver(PORT, wide_angle_crop=False, max_width=1000)
 
     print(f"✅ 接收端就绪 (多线程优化 + 探针支持)")
     print(f"📺 等待 1640x1232 或 820x616 视频流...")
 
     try:
         while True:
-            # 1. 获取最新帧 (非阻塞，瞬间完成)
-            frame, latency = receiver.get_latest()
+            # 1. 等待新帧 (事件驱动，最多等 5ms 以便响应按键)，再取最新帧
+            frame = None
+            if receiver.wait_for_new_frame(0.005):
+                frame, latency = receiver.get_latest()
 
             if frame is not None:
                 # 2. 渲染探针信息 (HUD)
@@ -227,24 +678,14 @@ if __name__ == "__main__":
                     elif latency > 50:
                         text_color = (0, 255, 255)  # 黄
 
-                # 绘制黑色背景框 + 文字
-                cv2.rectangle(frame, (5, 5), (240, 45), (0, 0, 0), -1)
-                cv2.putText(frame, info_text, (15, 35), cv2.FONT_HERSHEY_SIMPLEX,
-                            0.8, text_color, 2)
-
-                # 3. 显示
-                # 为了在电脑屏幕上看不撑满，可以缩放显示 (这不影响原始数据)
-                # 如果是 1640x1232，建议缩小一半看；如果是 820x616，可以直接看
-                display_h, display_w = frame.shape[:2]
-                if display_w > 1000:
-                    display_frame = cv2.resize(frame, (display_w // 2, display_h // 2))
-                else:
-                    display_frame = frame
+                # 黑色背景框 + 文字：贴上缓存的图块
+                frame[_HUD_Y0:_HUD_Y1, _HUD_X0:_HUD_X1] = _hud_tile(info_text, text_color)
 
-                cv2.imshow('Ultra Low Latency Stream', display_frame)
+                # 3. 显示 (缩放已在解码时完成)
+                cv2.imshow('Ultra Low Latency Stream', frame)
 
-            # 4. 响应按键 (因为有后台接收线程，这里的 waitKey 不会造成网络拥堵)
-            if cv2.waitKey(1) & 0xFF == ord('q'):
+            # 4. 响应按键 (pollKey 不阻塞；因为有后台接收线程，这里也不会造成网络拥堵)
+            if cv2.pollKey() & 0xFF == ord('q'):
                 break
 
     except KeyboardInterrupt:
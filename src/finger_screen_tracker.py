@@ -5,22 +5,23 @@ Integrates AprilTag screen detection with MediaPipe hand tracking.
 Maps finger position to screen coordinates using perspective-correct homography.
 """
 
+import functools
+import queue
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from types import SimpleNamespace
 
-<<<<<<< HEAD
 # Add parent directory to path for local imports
-=======
-from server.receiver import PORT, LowLatencyReceiver
-
-# Add parent directory to path for apriltage import
->>>>>>> afccd80a5dfe9c7b758a638df53372c2e997f404
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from server.receiver import frames_from_udp, create_udp_socket, PORT
+from server.receiver import PORT, LowLatencyReceiver
 
 import cv2
 import mediapipe as mp
+from mediapipe.framework.formats import landmark_pb2
 import numpy as np
 from numpy.typing import NDArray
 
@@ -31,11 +32,11 @@ from apriltage import (
     detect_screens,
     update_mapper,
     camera_to_ratio,
-    is_calibrated,
+    find_screen_ratio,
     get_screen_corners,
     MapperState,
-    CAMERA_WIDTH,
-    CAMERA_HEIGHT,
+    ScreenStack,
+    MAX_SCREENS,
     COLOR_GREEN,
     COLOR_MAGENTA,
     COLOR_RED,
@@ -50,9 +51,71 @@ from apriltage import (
 # FINGER TRACKING
 # =============================================================================
 
-def create_hand_tracker():
-    """Create MediaPipe hand tracker."""
+class _TaskHands:
+    """
+    MediaPipe Tasks HandLandmarker behind the solutions Hands interface.
+    
+    process() returns results with multi_hand_landmarks as landmark protos,
+    so the finger lookup and landmark drawing work unchanged.
+    """
+
+    def __init__(self, landmarker):
+        self._landmarker = landmarker
+        self._t0 = time.monotonic()
+        self._last_ms = -1
+
+    def process(self, rgb: NDArray[np.uint8]):
+        image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
+        # Video mode needs strictly increasing timestamps
+        ts_ms = max(int((time.monotonic() - self._t0) * 1000), self._last_ms + 1)
+        self._last_ms = ts_ms
+        result = self._landmarker.detect_for_video(image, ts_ms)
+        hands = [
+            landmark_pb2.NormalizedLandmarkList(landmark=[
+                landmark_pb2.NormalizedLandmark(x=lm.x, y=lm.y, z=lm.z) for lm in hand
+            ])
+            for hand in result.hand_landmarks
+        ]
+        return SimpleNamespace(multi_hand_landmarks=hands or None)
+
+    def close(self) -> None:
+        self._landmarker.close()
+
+
+def _create_gpu_landmarker(model_path: str) -> _TaskHands:
+    """Create a HandLandmarker running on the GPU delegate."""
+    BaseOptions = mp.tasks.BaseOptions
+    vision = mp.tasks.vision
+    options = vision.HandLandmarkerOptions(
+        base_options=BaseOptions(
+            model_asset_path=model_path, delegate=BaseOptions.Delegate.GPU
+        ),
+        running_mode=vision.RunningMode.VIDEO,
+        num_hands=1,
+        min_hand_detection_confidence=0.7,
+        min_hand_presence_confidence=0.7,
+        min_tracking_confidence=0.7,
+    )
+    return _TaskHands(vision.HandLandmarker.create_from_options(options))
+
+
+def create_hand_tracker(model_path: str | None = None):
+    """
+    Create MediaPipe hand tracker.
+    
+    Given a HandLandmarker model (hand_landmarker.task), inference runs on
+    the GPU delegate; without one, or if the GPU fails to initialize, the
+    CPU solutions tracker is used.
+    """
     mp_hands = mp.solutions.hands
+    if model_path is not None:
+        try:
+            hands = _create_gpu_landmarker(model_path)
+        except (RuntimeError, OSError, ValueError) as e:
+            print(f"GPU hand tracker unavailable ({e}), using CPU")
+        else:
+            return hands, mp_hands, mp.solutions.drawing_utils
+
     hands = mp_hands.Hands(
         static_image_mode=False,
         max_num_hands=1,
@@ -62,30 +125,46 @@ def create_hand_tracker():
     return hands, mp_hands, mp.solutions.drawing_utils
 
 
+def process_hands(
+    hands, frame: NDArray[np.uint8], rgb_buf: NDArray[np.uint8] | None = None
+):
+    """
+    Run MediaPipe once on a frame.
+    
+    rgb_buf, if it matches the frame size, receives the RGB conversion
+    instead of a fresh allocation; pass the returned buffer back in on
+    the next frame.
+    
+    Returns:
+        (results, rgb_buf)
+    """
+    if rgb_buf is None or rgb_buf.shape != frame.shape:
+        rgb_buf = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    else:
+        rgb_buf.flags.writeable = True
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb_buf)
+    rgb_buf.flags.writeable = False
+    return hands.process(rgb_buf), rgb_buf
+
+
 def get_index_finger_tip(
-    hands, frame: NDArray[np.uint8]
+    results, frame_shape: tuple[int, ...]
 ) -> tuple[int, int] | None:
-    """Get index finger tip position from frame."""
-    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    results = hands.process(rgb)
-
+    """Get index finger tip position from MediaPipe results."""
     if not results.multi_hand_landmarks:
         return None
 
     hand = results.multi_hand_landmarks[0]
     lm = hand.landmark[8]  # Index finger tip
 
-    h, w = frame.shape[:2]
+    h, w = frame_shape[:2]
     return int(lm.x * w), int(lm.y * h)
 
 
 def draw_hand_landmarks(
-    frame: NDArray[np.uint8], hands, mp_hands, mp_draw
+    frame: NDArray[np.uint8], results, mp_hands, mp_draw
 ) -> None:
-    """Draw hand landmarks on frame."""
-    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    results = hands.process(rgb)
-
+    """Draw hand landmarks from MediaPipe results on frame."""
     if results.multi_hand_landmarks:
         for hand in results.multi_hand_landmarks:
             mp_draw.draw_landmarks(frame, hand, mp_hands.HAND_CONNECTIONS)
@@ -121,7 +200,10 @@ def is_finger_in_screen(
 
 
 def find_finger_screen(
-    states: dict[int, MapperState], finger_x: int, finger_y: int
+    states: list[MapperState | None],
+    finger_x: int,
+    finger_y: int,
+    screen_stack: ScreenStack | None = None,
 ) -> tuple[int, tuple[float, float]] | None:
     """
     Find which screen the finger is pointing at.
@@ -129,15 +211,7 @@ def find_finger_screen(
     Returns:
         (screen_index, (rel_x, rel_y)) or None if finger not on any screen
     """
-    for screen_idx, state in states.items():
-        if not is_calibrated(state):
-            continue
-        result = camera_to_ratio(state, finger_x, finger_y)
-        if result:
-            rx, ry = result
-            if 0 <= rx <= 1 and 0 <= ry <= 1:
-                return screen_idx, (rx, ry)
-    return None
+    return find_screen_ratio(states, finger_x, finger_y, screen_stack)
 
 
 # =============================================================================
@@ -156,6 +230,20 @@ def draw_screen_boundary(frame: NDArray[np.uint8], state: MapperState) -> None:
     cv2.polylines(frame, [pts], True, COLOR_MAGENTA, LINE_THICKNESS)
 
 
+def draw_screen_boundaries(
+    frame: NDArray[np.uint8], states: list[MapperState | None]
+) -> None:
+    """Draw every fully detected screen's boundary in one polylines call."""
+    polygons = [
+        state["camera_corners"].astype(np.int32)  # truncates like get_screen_corners
+        for state in states
+        if state is not None
+        and state["num_tags_detected"] == 4 and state["camera_corners"] is not None
+    ]
+    if polygons:
+        cv2.polylines(frame, polygons, True, COLOR_MAGENTA, LINE_THICKNESS)
+
+
 def draw_finger_info(
     frame: NDArray[np.uint8],
     finger_pos: tuple[int, int] | None,
@@ -163,7 +251,7 @@ def draw_finger_info(
 ) -> None:
     """Draw finger position and screen mapping info."""
     if finger_pos is None:
-        cv2.putText(frame, "No hand detected", (10, 30), FONT, 0.7, COLOR_GRAY, 2)
+        _put_cached_text(frame, "No hand detected", (10, 30), 0.7, COLOR_GRAY, 2)
         return
 
     fx, fy = finger_pos
@@ -172,26 +260,62 @@ def draw_finger_info(
 
     if screen_result:
         screen_idx, (rx, ry) = screen_result
-        color = COLOR_GREEN
         text = f"Screen {screen_idx}: ({rx:.3f}, {ry:.3f})"
+        cv2.putText(frame, text, (10, 30), FONT, 0.8, COLOR_GREEN, 2)
     else:
-        color = COLOR_RED
-        text = "Outside screen bounds"
-
-    cv2.putText(frame, text, (10, 30), FONT, 0.8, color, 2)
+        _put_cached_text(frame, "Outside screen bounds", (10, 30), 0.8, COLOR_RED, 2)
     cv2.putText(frame, f"Finger: ({fx}, {fy})", (10, 60), FONT, 0.6, COLOR_GRAY, 2)
 
 
-def draw_calibration_status(
-    frame: NDArray[np.uint8], states: dict[int, MapperState], y_start: int = 90
+@functools.lru_cache(maxsize=256)
+def _text_sprite(
+    text: str, scale: float, color: tuple[int, int, int], thickness: int
+) -> tuple[NDArray[np.uint8], NDArray[np.float32], NDArray[np.float32], int, int]:
+    """
+    Rasterize text coverage once onto a tight sprite.
+    
+    Returns:
+        (fill, alpha, inv_alpha, dx, dy) - fill is the solid text color,
+        alpha the per-pixel coverage (anti-aliased edges included), and
+        (dx, dy) the sprite's top-left corner relative to the text origin
+    """
+    (w, h), baseline = cv2.getTextSize(text, FONT, scale, thickness)
+    pad = thickness
+    coverage = np.zeros((h + baseline + 2 * pad, w + 2 * pad), dtype=np.uint8)
+    cv2.putText(coverage, text, (pad, h + pad), FONT, scale, 255, thickness)
+    alpha = coverage.astype(np.float32) / 255.0
+    fill = np.empty((*coverage.shape, 3), dtype=np.uint8)
+    fill[:] = color
+    return fill, alpha, 1.0 - alpha, -pad, -(h + pad)
+
+
+def _put_cached_text(
+    frame: NDArray[np.uint8],
+    text: str,
+    org: tuple[int, int],
+    scale: float,
+    color: tuple[int, int, int],
+    thickness: int,
 ) -> None:
-    """Draw calibration status for all screens."""
-    if not states:
-        cv2.putText(frame, "No AprilTags detected", (10, y_start), FONT, 0.6, COLOR_RED, 2)
+    """cv2.putText via a cached sprite, for labels that repeat frame to frame."""
+    fill, alpha, inv_alpha, dx, dy = _text_sprite(text, scale, color, thickness)
+    x, y = org[0] + dx, org[1] + dy
+    sh, sw = alpha.shape
+    if x < 0 or y < 0 or y + sh > frame.shape[0] or x + sw > frame.shape[1]:
+        cv2.putText(frame, text, org, FONT, scale, color, thickness)
         return
+    roi = frame[y:y + sh, x:x + sw]
+    roi[:] = cv2.blendLinear(fill, roi, alpha, inv_alpha)
+
 
-    for i, (screen_idx, state) in enumerate(sorted(states.items())):
-        y = y_start + i * 25
+def draw_calibration_status(
+    frame: NDArray[np.uint8], states: list[MapperState | None], y_start: int = 90
+) -> None:
+    """Draw calibration status for all screens."""
+    y = y_start
+    for screen_idx, state in enumerate(states):
+        if state is None:
+            continue
         n = state["num_tags_detected"]
         if n == 4:
             color = COLOR_GREEN
@@ -202,15 +326,97 @@ def draw_calibration_status(
         else:
             color = COLOR_RED
             status = f"{n}/4 tags"
-        cv2.putText(frame, f"Screen {screen_idx}: {status}", (10, y), FONT, 0.5, color, 2)
+        _put_cached_text(frame, f"Screen {screen_idx}: {status}", (10, y), 0.5, color, 2)
+        y += 25
+
+    if y == y_start:
+        _put_cached_text(frame, "No AprilTags detected", (10, y_start), 0.6, COLOR_RED, 2)
 
 
 # =============================================================================
 # MAIN APPLICATION
 # =============================================================================
 
-def run_finger_tracker(camera_index: int = 0) -> None:
-    """Run the finger-to-screen coordinate tracker."""
+# The worker rotates each received frame into a ring of buffers big enough
+# that none is reused while still queued (queue + one drawn + one filled)
+_FLIP_RING_SIZE = 3
+
+# Tags are static once placed, so only scan for them every few frames
+TAG_STRIDE = 3
+
+# Back-to-back scans allowed while a seen screen has no homography, after
+# which the stride applies again (e.g. a screen with only one tag in view)
+REDETECT_LIMIT = 10
+
+
+def _inference_worker(
+    receiver: LowLatencyReceiver,
+    tag_detector,
+    hands,
+    render_q: queue.Queue,
+    stop: threading.Event,
+    redetect: threading.Event,
+) -> None:
+    """
+    Run MediaPipe on each new frame and AprilTag detection on every
+    TAG_STRIDE-th one, queueing (frame, detection, results) for the main thread.
+    
+    detection is None on skipped frames. Setting redetect makes the next
+    frame scan for tags regardless of the stride. Tag detection runs on its
+    own thread alongside MediaPipe, so a frame costs the slower of the two
+    rather than their sum.
+    """
+    rgb_buf = None
+    gray_buf: NDArray[np.uint8] | None = None
+    flip_bufs: list[NDArray[np.uint8] | None] = [None] * _FLIP_RING_SIZE
+    slot = 0
+    frame_count = 0
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="apriltag") as tag_pool:
+        while not stop.is_set():
+            # Wait for a new frame rather than spinning on the same one
+            if not receiver.wait_for_new_frame(timeout=0.1):
+                continue
+            frame, latency = receiver.get_latest()
+            if frame is None:
+                continue
+
+            # Rotate 180° into our own buffer: the receiver reuses its arrays and
+            # the main thread draws on this one. A frame[::-1, ::-1] view would
+            # not save the write, since OpenCV copies negative-stride input anyway
+            buf = flip_bufs[slot]
+            if buf is None or buf.shape != frame.shape:
+                buf = flip_bufs[slot] = np.empty_like(frame)
+            frame = cv2.flip(frame, -1, dst=buf)
+            slot = (slot + 1) % _FLIP_RING_SIZE
+            # Both conversions land in reused buffers: grayscale for the tags
+            # on the pool thread, RGB for MediaPipe here
+            tag_future = None
+            if frame_count % TAG_STRIDE == 0 or redetect.is_set():
+                redetect.clear()
+                if gray_buf is None or gray_buf.shape != frame.shape[:2]:
+                    gray_buf = np.empty(frame.shape[:2], dtype=np.uint8)
+                tag_future = tag_pool.submit(detect_tags, tag_detector, frame, gray_buf)
+            frame_count += 1
+
+            # Run MediaPipe once; finger lookup and drawing share the results
+            results, rgb_buf = process_hands(hands, frame, rgb_buf)
+            detection = tag_future.result() if tag_future is not None else None
+
+            # Block while the main thread is behind, but keep checking for shutdown
+            while not stop.is_set():
+                try:
+                    render_q.put((frame, detection, results), timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+
+
+def run_finger_tracker(port: int = PORT, hand_model: str | None = None) -> None:
+    """
+    Run the finger-to-screen coordinate tracker on the UDP camera stream.
+    
+    hand_model is an optional HandLandmarker .task file for GPU inference.
+    """
     print("""
 ==================================================
 Finger-to-Screen Coordinate Tracker
@@ -228,53 +434,71 @@ Controls:
 
     # Initialize detectors
     tag_detector = create_detector()
-    hands, mp_hands, mp_draw = create_hand_tracker()
-    states: dict[int, MapperState] = {}
-
-    # Open camera
-    cap = cv2.VideoCapture(camera_index)
-    if not cap.isOpened():
-        print(f"Error: Cannot open camera {camera_index}")
-        return
-
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_WIDTH)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_HEIGHT)
+    hands, mp_hands, mp_draw = create_hand_tracker(hand_model)
+    # Indexed by screen index; None until a screen's tags are first seen
+    states: list[MapperState | None] = [None] * MAX_SCREENS
+    screen_stack = ScreenStack()
 
     window_name = "Finger Screen Tracker"
     cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
 
-    receiver = LowLatencyReceiver(PORT, wide_angle_crop=False)
+    # Frames come from the UDP stream, so no local camera is opened
+    receiver = LowLatencyReceiver(port, wide_angle_crop=False, pin_threads=True)
+
+    # Detection and inference run on a worker thread, so the next frame is
+    # processed while this one is drawn; maxsize=1 keeps it one frame ahead
+    render_q: queue.Queue = queue.Queue(maxsize=1)
+    stop = threading.Event()
+    redetect = threading.Event()
+    redetect_streak = 0
+    worker = threading.Thread(
+        target=_inference_worker,
+        args=(receiver, tag_detector, hands, render_q, stop, redetect),
+        daemon=True,
+    )
+    worker.start()
     try:
         while True:
-            frame, latency = receiver.get_latest()
-
-            if frame is None:
+            try:
+                frame, detection, results = render_q.get(timeout=0.1)
+            except queue.Empty:
+                if cv2.waitKey(1) & 0xFF in (ord("q"), 27):
+                    break
                 continue
 
-            frame = cv2.flip(frame, -1)
-            # Detect AprilTags and update screen mappers
-            detection = detect_tags(tag_detector, frame)
-            visible_screens = detect_screens(list(detection["tag_corners"].keys()))
-
-            for screen_idx in visible_screens:
-                if screen_idx not in states:
-                    states[screen_idx] = create_mapper(screen_index=screen_idx)
-
-            for state in states.values():
-                update_mapper(state, detection["tag_corners"])
-
-            # Get finger position
-            finger_pos = get_index_finger_tip(hands, frame)
-
-            # Find which screen finger is on
+            # Update screen mappers on frames that were scanned for tags
+            if detection is not None:
+                tag_corners = detection["tag_corners"]
+                visible_screens = detect_screens(list(tag_corners.keys()))
+
+                # Only screens with a tag in view are updated; a screen whose tags
+                # are all hidden (e.g. behind the hand) keeps its last homography
+                for screen_idx in visible_screens:
+                    state = states[screen_idx]
+                    if state is None:
+                        state = states[screen_idx] = create_mapper(screen_index=screen_idx)
+                    update_mapper(state, tag_corners)
+
+                # Scan again on the next frame while no screen is calibrated or a
+                # seen screen lost its homography; a screen settled on the 3-tag
+                # fallback or with one tag covered keeps the regular stride
+                known = [st for st in states if st is not None]
+                if not known or any(st["homography"] is None for st in known):
+                    if redetect_streak < REDETECT_LIMIT:
+                        redetect_streak += 1
+                        redetect.set()
+                else:
+                    redetect_streak = 0
+
+            finger_pos = get_index_finger_tip(results, frame.shape)
+
+            # Landmarks and the screen lookup only matter with a hand in view;
+            # an idle frame just gets the boundaries and cached status text
             screen_result = None
-            if finger_pos:
-                screen_result = find_finger_screen(states, *finger_pos)
-
-            # Draw visualizations
-            draw_hand_landmarks(frame, hands, mp_hands, mp_draw)
-            for state in states.values():
-                draw_screen_boundary(frame, state)
+            if finger_pos is not None:
+                screen_result = find_finger_screen(states, *finger_pos, screen_stack)
+                draw_hand_landmarks(frame, results, mp_hands, mp_draw)
+            draw_screen_boundaries(frame, states)
             draw_finger_info(frame, finger_pos, screen_result)
             draw_calibration_status(frame, states)
 
@@ -285,7 +509,9 @@ Controls:
                 break
 
     finally:
-        cap.release()
+        stop.set()
+        worker.join(timeout=1.0)
+        receiver.stop()
         cv2.destroyAllWindows()
         hands.close()
 
@@ -294,7 +520,11 @@ if __name__ == "__main__":
     import argparse
 
     parser = argparse.ArgumentParser(description="Finger-to-Screen Coordinate Tracker")
-    parser.add_argument("-c", "--camera", type=int, default=0, help="Camera index")
+    parser.add_argument("-p", "--port", type=int, default=PORT, help="UDP stream port")
+    parser.add_argument(
+        "--hand-model",
+        help="HandLandmarker .task model; runs hand inference on the GPU (falls back to CPU)",
+    )
     args = parser.parse_args()
 
-    run_finger_tracker(camera_index=args.camera)
+    run_finger_tracker(port=args.port, hand_model=args.hand_model)
@@ -1,7 +1,7 @@
 """Hand gesture recognition module."""
 
 from .config import ViewMode, VIEW_MODE, MAX_NUM_HANDS
-from .features import HandFeatures, extract_features, get_handedness_label
+from .features import HandFeatures, LandmarkArrays, extract_features, get_handedness_label
 from .gestures import (
     HandState,
     DetectedHand,
@@ -19,6 +19,7 @@ __all__ = [
     "VIEW_MODE",
     "MAX_NUM_HANDS",
     "HandFeatures",
+    "LandmarkArrays",
     "extract_features",
     "get_handedness_label",
     "HandState",
@@ -16,6 +16,11 @@ FORCE_MIRROR_INPUT = False
 INVERT_HANDEDNESS = True
 MAX_NUM_HANDS = 2
 
+# MediaPipe input: frames wider than INFERENCE_WIDTH are downscaled first
+# (landmarks are normalized, so features still use full-res pixels); 0 disables
+INFERENCE_WIDTH = 480
+MODEL_COMPLEXITY = 1  # 0 = lite model, 1 = full model
+
 # Derived flip settings
 DISPLAY_FLIP = VIEW_MODE == ViewMode.SELFIE_WEBCAM
 PROCESS_FLIP = VIEW_MODE == ViewMode.SELFIE_WEBCAM
@@ -28,6 +33,9 @@ if FORCE_MIRROR_INPUT:
 # =============================================================================
 # TIMING / LATCHING
 # =============================================================================
+# Seconds as floats against time.monotonic(), which never jumps with the wall
+# clock. Integer monotonic_ns() values exceed one 30-bit digit, so comparing
+# and adding them is slower in CPython than with floats
 PINCH_LATCH_S = 0.30
 CLAP_LATCH_S = 0.65
 TWO_FINGER_SWIPE_LATCH_S = 0.45
@@ -0,0 +1,89 @@
+"""Frame and overlay helpers shared by the gesture tracker apps."""
+
+import os
+
+import cv2
+
+from .config import DISPLAY_FLIP, INFERENCE_WIDTH, PROCESS_FLIP
+from .gestures import DetectedHand, HandState
+
+
+# Processing mirrors landmarks instead of pixels, so the frame only needs
+# flipping for display when the two settings disagree
+NET_FLIP = PROCESS_FLIP ^ DISPLAY_FLIP
+
+
+def configure_opencv_threads() -> None:
+    """Enable OpenCV's optimized paths, leaving half the cores to MediaPipe's own inference threads."""
+    cv2.setUseOptimized(True)
+    cv2.setNumThreads(max(1, (os.cpu_count() or 2) // 2))
+
+
+def to_frame_px(pt: tuple[int, int], w: int) -> tuple[int, int]:
+    """Map a processing-space pixel back onto the unflipped camera frame."""
+    return (w - 1 - pt[0], pt[1]) if PROCESS_FLIP else pt
+
+
+def inference_frame(frame, dst=None):
+    """
+    Downscale a frame to INFERENCE_WIDTH for MediaPipe, keeping aspect ratio.
+
+    Resizes into dst when it already has the target shape.
+    """
+    h, w = frame.shape[:2]
+    if not INFERENCE_WIDTH or w <= INFERENCE_WIDTH:
+        return frame
+    size = (INFERENCE_WIDTH, round(h * INFERENCE_WIDTH / w))
+    if dst is not None and dst.shape != (size[1], size[0]) + frame.shape[2:]:
+        dst = None
+    return cv2.resize(frame, size, dst=dst, interpolation=cv2.INTER_AREA)
+
+
+# Display label for every (thumbrot, latched, pinch, two_finger, pointer) bitmask,
+# taking the highest-priority set bit; None means "use the latched label"
+_LABEL_PRIORITY = ((16, "HandRot"), (8, None), (4, "Pinch (held)"), (2, "TwoFinger (ready)"), (1, "Pointer"))
+_LABELS = tuple(
+    next((label for bit, label in _LABEL_PRIORITY if mask & bit), "Neutral")
+    for mask in range(32)
+)
+
+
+def get_display_label(d: DetectedHand, state: HandState, now: float) -> str:
+    """Get display label for detected hand."""
+    mask = (d.thumbrot << 4) | ((now < state.latched_until) << 3) | (d.pinch << 2) | (d.two_finger << 1) | d.pointer
+    return _LABELS[mask] or state.latched_label
+
+
+def hand_overlay_line(d: DetectedHand, state: HandState, disp: str) -> str:
+    """Format a hand's overlay line, reusing the cached one if nothing changed."""
+    if d.thumbrot and d.yaw is not None:
+        key = (disp, round(d.yaw, 1), round(d.pitch, 1), round(d.roll, 1))
+    else:
+        key = (disp,)
+    if key != state.overlay_key:
+        state.overlay_key = key
+        if len(key) > 1:
+            state.overlay_text = f"{d.label}: {disp}  yaw={d.yaw:+.1f}  pitch={d.pitch:+.1f}  roll={d.roll:+.1f}"
+        else:
+            state.overlay_text = f"{d.label}: {disp}"
+    return state.overlay_text
+
+
+# Overlay layout: a full-width box, so no per-frame text measuring, and
+# non-antialiased text, which is several times cheaper than LINE_AA
+_OVERLAY_FONT = cv2.FONT_HERSHEY_SIMPLEX
+_OVERLAY_X0, _OVERLAY_Y0, _OVERLAY_LINE_H = 12, 22, 22
+
+
+def draw_overlay(frame, overlay: list[str]) -> None:
+    """Draw text overlay on frame."""
+    if not overlay:
+        return
+    box_w = frame.shape[1] - 24
+    box_h = 12 + _OVERLAY_LINE_H * len(overlay)
+
+    cv2.rectangle(frame, (8, 8), (8 + box_w, 8 + box_h), (0, 0, 0), -1)
+    y = _OVERLAY_Y0
+    for s in overlay:
+        cv2.putText(frame, s, (_OVERLAY_X0, y), _OVERLAY_FONT, 0.6, (255, 255, 255), 2, cv2.LINE_8)
+        y += _OVERLAY_LINE_H
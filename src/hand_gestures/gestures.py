@@ -5,6 +5,13 @@ from collections import deque
 from dataclasses import dataclass, field
 from typing import Callable
 
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # optional: the swipe window scan then runs as plain Python
+    njit = None
+
 from .math_utils import dist2, dist3, angle_delta_deg, update_hysteresis
 from .features import HandFeatures, hand_orientation_angles
 from .config import (
@@ -26,7 +33,11 @@ def _timestamp() -> str:
     return time.strftime('%H:%M:%S')
 
 
-@dataclass
+# Two-finger swipe samples kept per hand; TFS_WINDOW_S at up to ~200 fps
+TFS_TRACK_CAPACITY = 64
+
+
+@dataclass(slots=True)
 class HandState:
     """Per-hand gesture state tracking."""
     label: str
@@ -42,16 +53,25 @@ class HandState:
     thumbs_exit: int = 0
     last_thumb_log: float = 0.0
 
-    tfs_track: deque = field(default_factory=deque)
+    # Two-finger swipe samples (time, x, flick angle) as a ring buffer
+    tfs_t: np.ndarray = field(default_factory=lambda: np.zeros(TFS_TRACK_CAPACITY))
+    tfs_x: np.ndarray = field(default_factory=lambda: np.zeros(TFS_TRACK_CAPACITY))
+    tfs_a: np.ndarray = field(default_factory=lambda: np.zeros(TFS_TRACK_CAPACITY))
+    tfs_head: int = 0
+    tfs_len: int = 0
     tfs_cooldown_until: float = 0.0
 
+    # Last formatted overlay line and the values it was built from
+    overlay_key: tuple | None = None
+    overlay_text: str = ""
+
     def latch(self, label: str, now: float, hold_s: float):
         """Set latched gesture label with hold duration."""
         self.latched_label = label
         self.latched_until = max(self.latched_until, now + hold_s)
 
 
-@dataclass
+@dataclass(slots=True)
 class DetectedHand:
     """Detection result for a single hand."""
     label: str
@@ -63,6 +83,8 @@ class DetectedHand:
     yaw: float | None = None
     pitch: float | None = None
     roll: float | None = None
+    # Per-hand tracking state this detection was evaluated against
+    state: HandState | None = field(default=None, repr=False, compare=False)
 
 
 # =============================================================================
@@ -178,6 +200,33 @@ def update_thumbrot(
 # TWO FINGER SWIPE
 # =============================================================================
 
+def _swipe_window_kernel(t, x, head, n, now, window_s):
+    """
+    Drop ring samples older than window_s, then scan the rest.
+    
+    Returns:
+        (head, n, peak_dx) - the new ring start and length, and max(x) - min(x)
+    """
+    cap = t.shape[0]
+    while n > 0 and now - t[head] > window_s:
+        head = (head + 1) % cap
+        n -= 1
+    if n == 0:
+        return head, n, 0.0
+    lo = hi = x[head]
+    for k in range(1, n):
+        v = x[(head + k) % cap]
+        if v < lo:
+            lo = v
+        elif v > hi:
+            hi = v
+    return head, n, hi - lo
+
+
+_swipe_window = (
+    njit(cache=True)(_swipe_window_kernel) if njit is not None else _swipe_window_kernel
+)
+
 def update_two_finger_swipe(
     state: HandState, feats: HandFeatures, now: float, 
     two_finger: bool, suppressed: bool
@@ -189,7 +238,7 @@ def update_two_finger_swipe(
         (detected, direction) - direction is "left" or "right" if detected, None otherwise
     """
     if not two_finger or suppressed or now < state.tfs_cooldown_until:
-        state.tfs_track.clear()
+        state.tfs_len = 0
         return False, None
 
     x_tips = 0.5 * (feats.index_tip_px[0] + feats.middle_tip_px[0])
@@ -197,20 +246,28 @@ def update_two_finger_swipe(
     x = 0.65 * x_tips + 0.35 * palm_x
     ang = feats.flick_angle_deg
 
-    state.tfs_track.append((now, x, ang))
-
-    while state.tfs_track and (now - state.tfs_track[0][0]) > TFS_WINDOW_S:
-        state.tfs_track.popleft()
-
-    if len(state.tfs_track) < 3:
+    # Append to the ring, overwriting the oldest sample when full
+    if state.tfs_len == TFS_TRACK_CAPACITY:
+        state.tfs_head = (state.tfs_head + 1) % TFS_TRACK_CAPACITY
+        state.tfs_len -= 1
+    last = (state.tfs_head + state.tfs_len) % TFS_TRACK_CAPACITY
+    state.tfs_t[last] = now
+    state.tfs_x[last] = x
+    state.tfs_a[last] = ang
+    state.tfs_len += 1
+
+    head, n, peak_dx = _swipe_window(
+        state.tfs_t, state.tfs_x, state.tfs_head, state.tfs_len, now, TFS_WINDOW_S
+    )
+    state.tfs_head, state.tfs_len = head, n
+
+    if n < 3:
         return False, None
 
-    t0, x0, a0 = state.tfs_track[0]
-    t1, x1, a1 = state.tfs_track[-1]
+    t0, x0, a0 = float(state.tfs_t[head]), float(state.tfs_x[head]), float(state.tfs_a[head])
+    t1, x1, a1 = now, x, ang
     dt = max(t1 - t0, 1e-6)
 
-    xs = [p[1] for p in state.tfs_track]
-    peak_dx = max(xs) - min(xs)
     net_dx = x1 - x0
     consistency = abs(net_dx) / (peak_dx + 1e-6)
     peak_speed = peak_dx / dt
@@ -227,7 +284,7 @@ def update_two_finger_swipe(
         print(f"[{_timestamp()}] {state.label}: TwoFingerSwipe ({direction})")
         state.latch("TwoFingerSwipe", now, TWO_FINGER_SWIPE_LATCH_S)
         state.tfs_cooldown_until = now + TFS_COOLDOWN_S
-        state.tfs_track.clear()
+        state.tfs_len = 0
         return True, direction
 
     return False, None
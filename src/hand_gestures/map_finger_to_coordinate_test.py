@@ -1,11 +1,19 @@
+import sys
+from pathlib import Path
+
 import cv2
-import mediapipe as mp
 import pyautogui
 import threading
 
 
 import numpy as np
 
+# Add the repository root to path for local imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.hand_tracks import FrameGrabber, HandTracker
+from src.hand_tracks.hand_tracker import INDEX_FINGER_TIP
+
 def finger_to_coordinate(box: tuple[int, int, int, int], finger_coord: tuple[int, int]):
     """
     box: (x1, y1, x2, y2)
@@ -25,17 +33,15 @@ def finger_to_coordinate(box: tuple[int, int, int, int], finger_coord: tuple[int
 
 
 
-mp_hands = mp.solutions.hands
-mp_draw = mp.solutions.drawing_utils
-
-hands = mp_hands.Hands(
-    static_image_mode=False,
-    max_num_hands=1,
-    min_detection_confidence=0.7,
-    min_tracking_confidence=0.7
-)
+tracker = HandTracker(max_num_hands=1)
 
 cap = cv2.VideoCapture(0)
+cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+# Read the camera on its own thread so inference never waits on it
+grabber = FrameGrabber(cap)
+grabber.start()
+
 cv2.namedWindow("Purple Box Touch Test", cv2.WINDOW_NORMAL)
 cv2.resizeWindow("Purple Box Touch Test", 960, 720)
 
@@ -44,12 +50,16 @@ cv2.resizeWindow("Purple Box Touch Test", 960, 720)
 # ==============================
 try:
     while True:
-        ret, frame = cap.read()
-        if not ret:
+        latest = grabber.read(timeout=0.1)
+        if latest is None:
+            if cv2.waitKey(1) & 0xFF == 27:  # ESC
+                break
             continue
+        _, frame = latest
 
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = hands.process(rgb)
+        # HandTracker converts into a reused RGB buffer before running MediaPipe
+        tracker.process(frame)
+        landmarks_px = tracker.get_landmarks_px(frame)
 
         frame_height, frame_width, _ = frame.shape
 
@@ -61,14 +71,10 @@ try:
 
         box = (x1, y1, x2, y2)
 
-        if results.multi_hand_landmarks:
-            hand = results.multi_hand_landmarks[0]
-            lm = hand.landmark
-
-            mp_draw.draw_landmarks(frame, hand, mp_hands.HAND_CONNECTIONS)
+        if landmarks_px is not None:
+            tracker.draw_landmarks(frame)
 
-            finger_x = int(lm[8].x * frame_width)
-            finger_y = int(lm[8].y * frame_height)
+            finger_x, finger_y = landmarks_px[INDEX_FINGER_TIP].tolist()
 
             # Compute relative coordinates
             rel_x, rel_y = finger_to_coordinate(box, (finger_x, finger_y))
@@ -92,5 +98,7 @@ try:
             break
 
 finally:
+    grabber.stop()
+    tracker.close()
     cap.release()
     cv2.destroyAllWindows()
\ No newline at end of file
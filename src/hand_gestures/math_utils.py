@@ -2,6 +2,10 @@
 
 import math
 
+# These stay plain Python: with numba installed, features.py already runs the
+# per-hand geometry as one compiled kernel, and jitting the helpers one by one
+# would add ~0.45 µs of dispatch per call, more than dist3 itself costs
+
 Point2 = tuple[int, int]
 Point3 = tuple[float, float, float]
 Vec3 = tuple[float, float, float]
@@ -14,7 +18,7 @@ def dist2(a: Point2, b: Point2) -> float:
 
 def dist3(a: Point3, b: Point3) -> float:
     """Euclidean distance between 3D points."""
-    return math.sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2)
+    return math.dist(a, b)
 
 
 def clamp(v: float, lo: float, hi: float) -> float:
@@ -65,16 +69,22 @@ def norm3(a: Vec3) -> float:
 
 def normalize3(a: Vec3) -> Vec3:
     """Normalize 3D vector to unit length."""
-    n = norm3(a)
-    return (a[0] / n, a[1] / n, a[2] / n)
+    x, y, z = a
+    n = math.sqrt(x * x + y * y + z * z) + 1e-9  # norm3, inlined
+    return (x / n, y / n, z / n)
 
 
 def angle_3pt_deg(a: Point3, b: Point3, c: Point3) -> float:
     """Angle at point B formed by points A-B-C, in degrees."""
-    ba = sub3(a, b)
-    bc = sub3(c, b)
-    cos_ang = clamp(dot3(ba, bc) / (norm3(ba) * norm3(bc)), -1.0, 1.0)
-    return math.degrees(math.acos(cos_ang))
+    # Same arithmetic as sub3/dot3/norm3/clamp, inlined: this runs for five
+    # joints per hand per frame, and the helper calls cost more than the math
+    bx, by, bz = b
+    ax, ay, az = a[0] - bx, a[1] - by, a[2] - bz
+    cx, cy, cz = c[0] - bx, c[1] - by, c[2] - bz
+    na = math.sqrt(ax * ax + ay * ay + az * az) + 1e-9
+    nc = math.sqrt(cx * cx + cy * cy + cz * cz) + 1e-9
+    cos_ang = (ax * cx + ay * cy + az * cz) / (na * nc)
+    return math.degrees(math.acos(max(-1.0, min(1.0, cos_ang))))
 
 
 def wrap_deg(angle: float) -> float:
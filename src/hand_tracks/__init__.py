@@ -1,10 +1,12 @@
 """Hand tracking and screen mapping module."""
 
+from .capture import FrameGrabber
 from .hand_tracker import HandTracker
 from .screen_mapper import MultiScreenMapper, ScreenResult
 from .visualization import TrackerDisplay, draw_screen_boundaries, draw_finger_marker
 
 __all__ = [
+    "FrameGrabber",
     "HandTracker",
     "MultiScreenMapper",
     "ScreenResult",
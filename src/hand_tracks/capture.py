@@ -0,0 +1,63 @@
+"""Background camera capture."""
+
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray
+
+
+class FrameGrabber(threading.Thread):
+    """
+    Reads a VideoCapture on a background thread, keeping only the newest frame.
+
+    Every frame is grabbed so the driver queue never backs up, but a frame is
+    only decoded (retrieved) once a reader is waiting for one; frames that
+    arrive while the reader is busy are dropped without being decoded.
+    """
+
+    def __init__(self, cap: cv2.VideoCapture):
+        super().__init__(daemon=True)
+        self._cap = cap
+        self._latest: deque[tuple[float, NDArray[np.uint8]]] = deque(maxlen=1)
+        self._wanted = threading.Event()
+        self._new_frame = threading.Event()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.is_set() and self._cap.isOpened():
+            if not self._cap.grab():
+                continue
+            t = time.monotonic()
+            if not self._wanted.is_set():
+                continue
+            ok, frame = self._cap.retrieve()
+            if not ok:
+                continue
+            self._wanted.clear()
+            self._latest.append((t, frame))
+            self._new_frame.set()
+
+    def read(self, timeout: float | None = None) -> tuple[float, NDArray[np.uint8]] | None:
+        """
+        Wait for a frame newer than the last one returned.
+
+        Returns:
+            (capture time from time.monotonic(), frame), or None on timeout
+        """
+        self._wanted.set()
+        if not self._new_frame.wait(timeout):
+            return None
+        self._new_frame.clear()
+        try:
+            return self._latest.pop()
+        except IndexError:
+            return None
+
+    def stop(self) -> None:
+        """Stop the capture loop and wait for the thread to exit."""
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout=1.0)
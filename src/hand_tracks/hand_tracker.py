@@ -5,6 +5,8 @@ import mediapipe as mp
 import numpy as np
 from numpy.typing import NDArray
 
+from ..hand_gestures.features import LandmarkArrays
+
 
 INDEX_FINGER_TIP = 8
 
@@ -27,24 +29,45 @@ class HandTracker:
             min_tracking_confidence=min_tracking_confidence,
         )
         self._last_results = None
+        self._rgb_buf: NDArray[np.uint8] | None = None
+        self._landmarks = LandmarkArrays()
 
     def process(self, frame: NDArray[np.uint8]) -> None:
         """Process frame for hand detection."""
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        # Convert into the previous frame's RGB buffer when the size matches
+        rgb = self._rgb_buf
+        if rgb is None or rgb.shape != frame.shape:
+            rgb = self._rgb_buf = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        else:
+            rgb.flags.writeable = True
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb)
+        # Read-only lets MediaPipe wrap the buffer without copying it
+        rgb.flags.writeable = False
         self._last_results = self._hands.process(rgb)
 
     def get_index_finger_tip(self, frame: NDArray[np.uint8]) -> tuple[int, int] | None:
         """Get index finger tip position from last processed frame."""
         self.process(frame)
+
+        landmarks_px = self.get_landmarks_px(frame)
+        if landmarks_px is None:
+            return None
+        x, y = landmarks_px[INDEX_FINGER_TIP].tolist()
+        return x, y
+
+    def get_landmarks_px(self, frame: NDArray[np.uint8]) -> NDArray[np.int32] | None:
+        """
+        Get the first hand's 21 landmarks as (x, y) pixels from last processed frame.
         
+        All landmarks are scaled in one array operation into a reused buffer,
+        so the result is overwritten by the next call.
+        """
         if not self._last_results or not self._last_results.multi_hand_landmarks:
             return None
 
-        hand = self._last_results.multi_hand_landmarks[0]
-        lm = hand.landmark[INDEX_FINGER_TIP]
-
         h, w = frame.shape[:2]
-        return int(lm.x * w), int(lm.y * h)
+        px, _ = self._landmarks.load(self._last_results.multi_hand_landmarks[0], w, h)
+        return px
 
     def draw_landmarks(self, frame: NDArray[np.uint8]) -> None:
         """Draw hand landmarks on frame."""
@@ -2,19 +2,27 @@
 
 from dataclasses import dataclass
 
+import numpy as np
+
 from apriltage import (
+    DetectionResult,
     MapperState,
+    ScreenStack,
     create_detector,
     create_mapper,
     detect_tags,
     detect_screens,
     update_mapper,
-    camera_to_ratio,
+    find_screen_ratio,
     is_calibrated,
     get_screen_corners,
 )
 
 
+# Tags are static once placed, so only re-detect every few frames
+DETECT_PERIOD = 5
+
+
 @dataclass
 class ScreenResult:
     """Result of finger-to-screen mapping."""
@@ -30,27 +38,77 @@ class ScreenResult:
 class MultiScreenMapper:
     """Manages AprilTag detection and screen coordinate mapping."""
 
-    def __init__(self):
+    def __init__(self, detect_period: int = DETECT_PERIOD):
         self._detector = create_detector()
         self._states: dict[int, MapperState] = {}
+        self._screen_stack = ScreenStack()
         self._last_detection = None
+        self._detect_period = max(1, detect_period)
+        self._frames_since_detect = 0
+        self._detect_requested = False
+        self._gray_buf = None
 
     @property
     def states(self) -> dict[int, MapperState]:
         """Access to screen states for visualization."""
         return self._states
 
-    def update(self, frame) -> None:
-        """Detect AprilTags and update screen mappers."""
-        self._last_detection = detect_tags(self._detector, frame)
-        visible_screens = detect_screens(list(self._last_detection["tag_corners"].keys()))
+    def update(self, frame) -> bool:
+        """
+        Detect AprilTags and update screen mappers.
+        
+        Detection runs on the first call and then once every detect_period
+        calls, or on the next call after request_detect().
+        
+        Returns:
+            True if detection ran on this frame
+        """
+        if not self.should_detect():
+            return False
+        self.apply(self.detect(frame))
+        return True
+
+    def should_detect(self) -> bool:
+        """
+        Advance the detection cadence by one frame.
+        
+        Returns:
+            True if this frame should be scanned for tags
+        """
+        if self._last_detection is not None:
+            self._frames_since_detect += 1
+            if self._frames_since_detect < self._detect_period and not self._detect_requested:
+                return False
+        self._frames_since_detect = 0
+        self._detect_requested = False
+        return True
+
+    def request_detect(self) -> None:
+        """Make the next should_detect() call due regardless of the cadence."""
+        self._detect_requested = True
+
+    def detect(self, frame) -> DetectionResult:
+        """
+        Detect AprilTags without touching the screen states.
+        
+        Safe to run on a worker thread while the states are read elsewhere,
+        as long as only one detect call runs at a time.
+        """
+        if self._gray_buf is None or self._gray_buf.shape != frame.shape[:2]:
+            self._gray_buf = np.empty(frame.shape[:2], dtype=np.uint8)
+        return detect_tags(self._detector, frame, self._gray_buf)
+
+    def apply(self, detection: DetectionResult) -> None:
+        """Update screen mappers from a detect() result."""
+        self._last_detection = detection
+        visible_screens = detect_screens(list(detection["tag_corners"].keys()))
 
         for screen_idx in visible_screens:
             if screen_idx not in self._states:
                 self._states[screen_idx] = create_mapper(screen_index=screen_idx)
 
         for state in self._states.values():
-            update_mapper(state, self._last_detection["tag_corners"])
+            update_mapper(state, detection["tag_corners"])
 
     def find_screen(self, x: int, y: int) -> ScreenResult | None:
         """
@@ -59,15 +117,11 @@ class MultiScreenMapper:
         Returns:
             ScreenResult with screen index and relative coords, or None
         """
-        for screen_idx, state in self._states.items():
-            if not is_calibrated(state):
-                continue
-            result = camera_to_ratio(state, x, y)
-            if result:
-                rx, ry = result
-                if 0 <= rx <= 1 and 0 <= ry <= 1:
-                    return ScreenResult(screen_idx, rx, ry)
-        return None
+        found = find_screen_ratio(self._states, x, y, self._screen_stack)
+        if found is None:
+            return None
+        screen_idx, (rx, ry) = found
+        return ScreenResult(screen_idx, rx, ry)
 
     def get_screen_corners(self, screen_idx: int) -> dict | None:
         """Get corner coordinates for a screen."""